@@ -1,7 +1,234 @@
 
-from collections import deque
+import heapq
+import math
+from collections import Counter, deque
+from itertools import chain
 
-def RR_algorithm(data, quantum):
+from hooks import bind
+
+BLOCK = 256
+STEP_SLICES = 32
+
+class LapQueue:
+    # the ready queue of skip_rounds, in the order one lap of the CPU serves it, cut
+    # into blocks of at most 2*BLOCK. Every process carries `final`, the lap of its last
+    # slice; each block keeps its smallest final, a heap (with live counts) keeps the
+    # smallest overall and a Fenwick tree over the block sizes finds positions, so
+    # insert, pop and "first process with the smallest final" cost O(BLOCK + blocks)
+    # in C plus O(log n) in Python, never a walk over the queue.
+    def __init__(self, procs=(), finals=()):
+        procs, finals = list(procs), list(finals)
+        self.procs = [procs[k:k + BLOCK] for k in range(0, len(procs), BLOCK)] or [[]]
+        self.finals = [finals[k:k + BLOCK] for k in range(0, len(finals), BLOCK)] or [[]]
+        self.low = [min(block, default=math.inf) for block in self.finals]
+        self.live = dict(Counter(finals))
+        self.heap = list(self.live)
+        heapq.heapify(self.heap)
+        self.size = len(procs)
+        self._index()
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return chain.from_iterable(self.procs)
+
+    def _index(self):
+        # Fenwick tree of the block sizes, rebuilt when blocks split or go away
+        nb = len(self.procs)
+        tree = [0] * (nb + 1)
+        for b, block in enumerate(self.procs, 1):
+            tree[b] += len(block)
+            up = b + (b & -b)
+            if up <= nb:
+                tree[up] += tree[b]
+        self.tree = tree
+        self.top = 1 << (nb.bit_length() - 1)
+
+    def _grow(self, b, delta):
+        tree = self.tree
+        n = len(tree)
+        b += 1
+        while b < n:
+            tree[b] += delta
+            b += b & -b
+
+    def _before(self, b):
+        # processes in the blocks before block b
+        tree = self.tree
+        total = 0
+        while b:
+            total += tree[b]
+            b -= b & -b
+        return total
+
+    def _find(self, k):
+        # (block, offset) of position k; k == len(self) is the end of the last block
+        if k >= self.size:
+            return len(self.procs) - 1, len(self.procs[-1])
+        tree = self.tree
+        n = len(tree)
+        b = 0
+        step = self.top
+        while step:
+            if b + step < n and tree[b + step] <= k:
+                b += step
+                k -= tree[b]
+            step >>= 1
+        return b, k
+
+    def __getitem__(self, k):
+        b, j = self._find(k)
+        return self.procs[b][j]
+
+    def insert(self, k, p, final):
+        b, j = self._find(k)
+        procs, finals = self.procs[b], self.finals[b]
+        procs.insert(j, p)
+        finals.insert(j, final)
+        if final < self.low[b]:
+            self.low[b] = final
+        if len(procs) > 2 * BLOCK:
+            self.procs[b:b + 1] = [procs[:BLOCK], procs[BLOCK:]]
+            self.finals[b:b + 1] = [finals[:BLOCK], finals[BLOCK:]]
+            self.low[b:b + 1] = [min(finals[:BLOCK]), min(finals[BLOCK:])]
+            self._index()
+        else:
+            self._grow(b, 1)
+        self.size += 1
+        if self.live.get(final, 0) == 0:
+            self.live[final] = 0
+            heapq.heappush(self.heap, final)
+        self.live[final] += 1
+
+    def pop(self, k):
+        b, j = self._find(k)
+        p = self.procs[b].pop(j)
+        final = self.finals[b].pop(j)
+        if not self.procs[b] and len(self.procs) > 1:
+            del self.procs[b], self.finals[b], self.low[b]
+            self._index()
+        else:
+            self._grow(b, -1)
+            if final == self.low[b]:
+                self.low[b] = min(self.finals[b], default=math.inf)
+        self.size -= 1
+        self.live[final] -= 1
+        return p
+
+    def first_final(self):
+        # smallest final in the queue and the position of the first process that has it
+        heap = self.heap
+        while not self.live[heap[0]]:
+            del self.live[heapq.heappop(heap)]
+        final = heap[0]
+        b = self.low.index(final)
+        return final, self._before(b) + self.finals[b].index(final)
+
+def _skip_rounds(ready, remain, t, i, pid, arrival, quantum, finish_time, first, on_arrival, on_done, on_phase):
+    # RR_algorithm's schedule in one step per arrival or completion, for as long as
+    # those steps cover many slices each. `queue` holds the ready processes in lap
+    # order: lap `lap` serves positions ptr.. and the ones before ptr already had their
+    # slice in it. While here remain[p] holds v = r + quantum*L for a process that
+    # entered (or re-entered) the queue for lap L with r left, so
+    #   remaining = v - quantum * (lap + 1 if its position < ptr else lap)
+    # and running the queue for s full slices only moves ptr and lap. The next process
+    # to finish is the first one (in lap order) with the smallest final lap; every
+    # slice before its last one is a full quantum, so the step to it (or to the slice
+    # an arrival lands in) is a count, not a walk.
+    # Returns (t, i, finished so far here) with `ready` and `remain` back in the slice
+    # loop's form, once the queue is empty or the steps stop paying for themselves.
+    n = len(arrival)
+    queue = LapQueue(ready, (max(-(-remain[p] // quantum), 1) - 1 for p in ready))
+    fresh = deque((j, p) for j, p in enumerate(ready) if first[p] < 0)    # (slice number of the first slice, p), in that order
+    sliced = 0          # slices so far
+    lap = ptr = 0
+    finished = 0
+    steps = covered = 0
+
+    def enter(p, k, at_lap, ahead):
+        # p joins at position k for lap at_lap with `ahead` processes to run before it
+        final = at_lap + max(-(-remain[p] // quantum), 1) - 1
+        remain[p] += quantum * at_lap
+        queue.insert(k, p, final)
+        fresh.append((sliced + ahead, p))
+        if on_arrival: on_arrival(arrival[p], pid[p])
+
+    while queue:
+        m = len(queue)
+        final, k = queue.first_final()
+        if final == lap:
+            skip = k - ptr
+        else:
+            skip = (m - ptr) + (final - lap - 1) * m + k
+        if i < n:
+            # the slice that ends at or after the next arrival is run on its own
+            skip = min(skip, -(-(arrival[i] - t) // quantum) - 1)
+        if skip > 0:
+            while fresh and fresh[0][0] < sliced + skip:
+                s, p = fresh.popleft()
+                first[p] = t + (s - sliced) * quantum
+            sliced += skip
+            t += skip * quantum
+            lap += (ptr + skip) // m
+            ptr = (ptr + skip) % m
+
+        p = queue[ptr]
+        if first[p] < 0:
+            first[p] = t
+            fresh.popleft()
+        if on_phase: on_phase("run")
+        left = remain[p] - quantum * lap
+        t += min(quantum, left)
+        sliced += 1
+        ptr += 1
+        if on_phase: on_phase("admit")
+        while i < n and arrival[i] <= t:
+            # ahead of p, which goes to the back for the next lap
+            enter(i, ptr - 1, lap + 1, len(queue) - 1)
+            ptr += 1
+            i += 1
+        if left <= quantum:
+            queue.pop(ptr - 1)
+            ptr -= 1
+            remain[p] = 0
+            finish_time[p] = t
+            finished += 1
+            if on_done: on_done(t, pid[p])
+        if ptr == len(queue):
+            lap += 1
+            ptr = 0
+
+        # a step costs about as much as STEP_SLICES plain slices; hand back to the slice
+        # loop when a queue's worth of steps has not saved that (rebuilding is O(queue))
+        steps += 1
+        covered += skip + 1
+        if steps >= max(len(queue), 16):
+            if covered < STEP_SLICES * steps:
+                break
+            steps = covered = 0
+
+    order = list(queue)
+    for k, p in enumerate(order):
+        remain[p] -= quantum * (lap + 1 if k < ptr else lap)
+    ready.clear()
+    ready.extend(order[ptr:])
+    ready.extend(order[:ptr])
+    return t, i, finished
+
+def RR_algorithm(data, quantum, skip_rounds=False, per_process=False, hooks=None):
+    # skip_rounds: once a full round of the ready queue passes without an arrival or a
+    # completion, jump from one of those to the next instead of running every slice
+    # (same result, see _skip_rounds)
+    # per_process: also return the per-process results as a DataFrame under "processes"
+    # and their tail metrics (metrics.summary)
+    # hooks: hooks.Observer instances. Per-slice events turn skip_rounds off so that
+    # every slice is reported
+
+    on_arrival, on_start, on_end, on_done, on_idle, on_switch, on_phase = bind(hooks)
+    if on_phase: on_phase("setup")
+    per_slice = bool(on_start or on_end or on_switch or on_phase)    # one check per slice without them
+    skip_rounds = skip_rounds and not (on_start or on_end or on_switch)
 
     pid     = data['process_id'].tolist()
     arrival = data['arrival_time'].tolist()
@@ -10,52 +237,91 @@ def RR_algorithm(data, quantum):
     n = len(pid)
     remain = burst[:]
     finish_time = [0]*n
+    first = [-1]*n
 
     i = 0 
     t = 0
     ready = deque()
     finished = 0
+    since_skip = 0
+    last = -1
 
     if n and t < arrival[0]:
+        if on_idle: on_idle(t, arrival[0])
         t = arrival[0]
     while i < n and arrival[i] <= t:
         ready.append(i)
+        if on_arrival: on_arrival(arrival[i], pid[i])
         i += 1
 
     while finished < n:
         if not ready:
 
             if i < n:
+                if on_idle and arrival[i] > t: on_idle(t, arrival[i])
                 t = max(t, arrival[i])
                 while i < n and arrival[i] <= t:
                     ready.append(i)
+                    if on_arrival: on_arrival(arrival[i], pid[i])
                     i += 1
             continue
 
+        if skip_rounds and since_skip >= STEP_SLICES and since_skip >= len(ready):
+            # a full round (and enough slices to pay for the switch) went by without an
+            # arrival or a completion
+            since_skip = 0
+            t, i, done = _skip_rounds(ready, remain, t, i, pid, arrival, quantum, finish_time, first,
+                                      on_arrival, on_done, on_phase)
+            finished += done
+            continue
+
         p = ready.popleft()
+        since_skip += 1
+        if first[p] < 0:
+            first[p] = t
+        if per_slice:
+            if on_phase: on_phase("run")
+            if on_switch:
+                if last >= 0 and p != last: on_switch(t, t)
+                last = p
+            if on_start: on_start(t, pid[p], len(ready))
         run = min(quantum, remain[p])
         t += run
         remain[p] -= run
+        if per_slice:
+            if on_end: on_end(t, pid[p], remain[p])
+            if on_phase: on_phase("admit")
 
         while i < n and arrival[i] <= t:
             ready.append(i)
+            if on_arrival: on_arrival(arrival[i], pid[i])
             i += 1
+            since_skip = 0
 
         if remain[p] == 0:
             finish_time[p] = t
             finished += 1
+            since_skip = 0
+            if on_done: on_done(t, pid[p])
         else:
             ready.append(p)
 
+    if on_phase: on_phase("summary")
 
     turnaround = [finish_time[k] - arrival[k] for k in range(n)]
     waiting    = [turnaround[k] - burst[k]     for k in range(n)]
     avg_wait   = sum(waiting)/n
     avg_turn   = sum(turnaround)/n
 
-    return {
+    out = {
         "n":n,
         "avg_waiting": f"{avg_wait:.4f}",
         "avg_turn": f"{avg_turn:.4f}",
         "time": f"{t}"
     }
+    if per_process:
+        from metrics import per_process as _per_process, summary
+        out["processes"] = _per_process(pid, arrival, burst, finish_time, first)
+        out.update(summary(out["processes"]))
+    if on_phase: on_phase("done")
+    return out
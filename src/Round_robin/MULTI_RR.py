@@ -0,0 +1,142 @@
+import heapq
+from collections import deque
+from statistics import pstdev
+
+
+def MultiRR(data, quantum, cores, shared=True, migration=0, steal=True, per_process=False):
+    # round robin on `cores` CPUs. Time only moves through events: a min-heap of
+    # (slice end, core) plus the next arrival, so the cost is O(slices * log cores)
+    # however long the schedule is.
+    # shared:    one ready queue for every core; otherwise each core has its own queue,
+    #            arrivals go to an idle core or else to the cores in turn
+    # migration: extra time paid when a process runs on a different core than last time
+    # steal:     per-core queues only - a core that runs dry takes the tail of the longest
+    #            queue (the lowest core among equals), found in O(log cores) amortized
+    # per_process: as in RR_algorithm
+
+    pid     = data['process_id'].tolist()
+    arrival = data['arrival_time'].tolist()
+    burst   = data['burst_time'].tolist()
+
+    n = len(pid)
+    remain = burst[:]
+    finish_time = [0]*n
+    last_core = [-1]*n
+    first = [-1]*n
+    order = sorted(range(n), key=arrival.__getitem__)
+
+    queues = [deque()] if shared else [deque() for _ in range(cores)]
+    running = [-1]*cores
+    busy = [0]*cores
+    overhead = [0]*cores
+    events = []                     # (time the running slice ends, core)
+    idle = list(range(cores))       # heap: the lowest idle core is woken first
+    migrations = 0
+    turn = 0
+    # stealing: heap of (-length, core) with, for every non-empty queue, an entry at
+    # least as long as it is. Only arrivals make a queue longer (a requeued slice is
+    # dispatched from the same queue straight away), so they alone push entries
+    stealing = steal and not shared
+    longest = []
+
+    def dispatch(c, t):
+        nonlocal migrations
+        q = queues[0] if shared else queues[c]
+        if not q and stealing:
+            while longest:
+                size, v = longest[0]
+                if len(queues[v]) == -size:
+                    q.append(queues[v].pop())
+                    break
+                if queues[v]:
+                    heapq.heapreplace(longest, (-len(queues[v]), v))
+                else:
+                    heapq.heappop(longest)
+        if not q:
+            return False
+        p = q.popleft()
+        cost = 0
+        if last_core[p] != c:
+            if last_core[p] >= 0:
+                cost = migration
+                migrations += 1
+                overhead[c] += cost
+            last_core[p] = c
+        if first[p] < 0:
+            first[p] = t + cost
+        run = min(quantum, remain[p])
+        remain[p] -= run
+        busy[c] += run
+        running[c] = p
+        heapq.heappush(events, (t + cost + run, c))
+        return True
+
+    def admit(upto_time):
+        nonlocal i, turn
+        while i < n and arrival[order[i]] <= upto_time:
+            p = order[i]
+            i += 1
+            if idle:
+                c = heapq.heappop(idle)
+                (queues[0] if shared else queues[c]).append(p)
+                dispatch(c, arrival[p])
+            elif shared:
+                queues[0].append(p)
+            else:
+                queues[turn].append(p)
+                if stealing:
+                    heapq.heappush(longest, (-len(queues[turn]), turn))
+                    if len(longest) > 4 * cores:
+                        # back to one exact entry per queue, O(cores) every 3*cores arrivals at most
+                        longest[:] = [(-len(q), k) for k, q in enumerate(queues) if q]
+                        heapq.heapify(longest)
+                turn = (turn + 1) % cores
+
+    i = 0
+    t = 0
+    finished = 0
+
+    while finished < n:
+        # with every core busy, arrivals only need to be queued by the next slice end
+        if events and (i >= n or not idle or events[0][0] <= arrival[order[i]]):
+            t, c = heapq.heappop(events)
+            admit(t)
+            p = running[c]
+            running[c] = -1
+            if remain[p] == 0:
+                finish_time[p] = t
+                finished += 1
+            else:
+                (queues[0] if shared else queues[c]).append(p)
+            if not dispatch(c, t):
+                heapq.heappush(idle, c)
+        else:
+            admit(arrival[order[i]])
+
+
+    turnaround = [finish_time[k] - arrival[k] for k in range(n)]
+    waiting    = [turnaround[k] - burst[k]     for k in range(n)]
+    avg_wait   = sum(waiting)/n
+    avg_turn   = sum(turnaround)/n
+
+    makespan = max(finish_time) if n else 0
+    util = [b / makespan * 100 if makespan else 0.0 for b in busy]
+    mean_busy = sum(busy) / cores
+
+    out = {
+        "n":n,
+        "avg_waiting": f"{avg_wait:.4f}",
+        "avg_turn": f"{avg_turn:.4f}",
+        "time": f"{makespan}",
+        "cores": cores,
+        "core_util": [round(u, 4) for u in util],       # % of the makespan each core ran work
+        "imbalance": f"{max(busy) / mean_busy if mean_busy else 1.0:.4f}",   # busiest core / mean, 1 = even
+        "busy_cv": f"{pstdev(busy) / mean_busy if mean_busy else 0.0:.4f}",
+        "migrations": migrations,
+        "migration_time": sum(overhead),
+    }
+    if per_process:
+        from metrics import per_process as _per_process, summary
+        out["processes"] = _per_process(pid, arrival, burst, finish_time, first)
+        out.update(summary(out["processes"]))
+    return out
@@ -0,0 +1,149 @@
+import heapq
+from collections import deque
+
+
+class ReadyLevels:
+    # one FIFO per priority level (lower number = higher priority) plus a heap of the
+    # levels that hold at least one live entry, so the best level costs O(log levels).
+    # Entries are (p, stamp); a push gives p a new stamp, which makes older entries
+    # of p (left behind by aging) stale so they are skipped instead of searched for.
+    def __init__(self, n):
+        self.queues = {}
+        self.live = {}
+        self.heap = []
+        self.in_heap = set()
+        self.stamp = [0]*n
+        self.level = [0]*n
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, p, level):
+        self.stamp[p] += 1
+        self.level[p] = level
+        q = self.queues.get(level)
+        if q is None:
+            q = self.queues[level] = deque()
+            self.live[level] = 0
+        q.append((p, self.stamp[p]))
+        self.live[level] += 1
+        self.size += 1
+        if level not in self.in_heap:
+            self.in_heap.add(level)
+            heapq.heappush(self.heap, level)
+        return self.stamp[p]
+
+    def discard(self, p):
+        # drop p's live entry; the deque entry goes stale and is skipped later
+        self.stamp[p] += 1
+        self.live[self.level[p]] -= 1
+        self.size -= 1
+
+    def pop(self):
+        heap = self.heap
+        while not self.live[heap[0]]:
+            level = heapq.heappop(heap)
+            self.in_heap.discard(level)
+            self.queues[level].clear()
+        level = heap[0]
+        q = self.queues[level]
+        while True:
+            p, stamp = q.popleft()
+            if stamp == self.stamp[p]:
+                break
+        self.stamp[p] += 1
+        self.live[level] -= 1
+        self.size -= 1
+        return p, level
+
+def PRIO_RR(data, quantum, aging=0, per_process=False):
+    # round robin inside each priority level, a higher level (lower number) always
+    # goes first and an arriving higher-priority process preempts the running one.
+    # aging: a ready process moves up one level for every `aging` time units it has
+    # waited (0 = off); it drops back to its own priority once it gets the CPU.
+    # per_process: as in RR_algorithm
+
+    pid      = data['process_id'].tolist()
+    arrival  = data['arrival_time'].tolist()
+    burst    = data['burst_time'].tolist()
+    priority = data['priority'].tolist()
+
+    n = len(pid)
+    remain = burst[:]
+    finish_time = [0]*n
+    first = [-1]*n
+    order = sorted(range(n), key=arrival.__getitem__)
+    top = min(priority) if n else 0
+
+    ready = ReadyLevels(n)
+    promotions = []         # (due, p, stamp) heap, only used with aging
+
+    def enqueue(p, level, since):
+        stamp = ready.push(p, level)
+        if aging and level > top:
+            heapq.heappush(promotions, (since + aging, p, stamp))
+
+    i = 0
+    t = 0
+    finished = 0
+
+    while finished < n:
+        if not ready:
+            t = max(t, arrival[order[i]])
+            while i < n and arrival[order[i]] <= t:
+                p = order[i]
+                enqueue(p, priority[p], arrival[p])
+                i += 1
+            continue
+
+        while promotions and promotions[0][0] <= t:
+            due, p, stamp = heapq.heappop(promotions)
+            if stamp != ready.stamp[p]:
+                continue
+            ready.discard(p)
+            enqueue(p, ready.level[p] - 1, due)
+
+        p, level = ready.pop()
+        if first[p] < 0:
+            first[p] = t
+        end = t + min(quantum, remain[p])
+
+        # the first strictly higher arrival inside the slice cuts it short
+        j = i
+        while j < n and arrival[order[j]] < end:
+            if priority[order[j]] < priority[p]:
+                end = arrival[order[j]]
+                break
+            j += 1
+        while i < n and arrival[order[i]] <= end:
+            q = order[i]
+            enqueue(q, priority[q], arrival[q])
+            i += 1
+
+        remain[p] -= end - t
+        t = end
+
+        if remain[p] == 0:
+            finish_time[p] = t
+            finished += 1
+        else:
+            enqueue(p, priority[p], t)
+
+
+    turnaround = [finish_time[k] - arrival[k] for k in range(n)]
+    waiting    = [turnaround[k] - burst[k]     for k in range(n)]
+    avg_wait   = sum(waiting)/n
+    avg_turn   = sum(turnaround)/n
+
+    out = {
+        "n":n,
+        "avg_waiting": f"{avg_wait:.4f}",
+        "avg_turn": f"{avg_turn:.4f}",
+        "time": f"{t}"
+    }
+    if per_process:
+        from metrics import per_process as _per_process, summary
+        out["processes"] = _per_process(pid, arrival, burst, finish_time, first)
+        out.update(summary(out["processes"]))
+    return out
@@ -1,12 +1,14 @@
-import pandas as pd
 # from timer import get_cpu_time_unit
-import numpy as np
-ilb = 0 # the time of CPU in rest
+# numpy (and pandas, through metrics) are imported where they are used:
+# RR() itself runs on plain lists and should start without them
+# Every call keeps its state in locals (the idle counter `ilb` used to be a module
+# global that piled up across calls), so RR() can run from many threads at once.
 
 def waiting_time(processes, n, burst_t, waiting_t, quantum):
-    global ilb
+    # fills waiting_t, returns this run's idle time (ilb)
+    ilb = 0 # the time of CPU in rest
     t = 0
-    remain = burst_t.copy()
+    remain = list(burst_t)
 
     while True:
         finish = True
@@ -27,6 +29,7 @@ def waiting_time(processes, n, burst_t, waiting_t, quantum):
 
         if finish:
             break
+    return ilb
 
 def turnaround_time(processes, n, burst_time, waiting, turnaround, quantum):
    for i in range(n):
@@ -40,14 +43,32 @@ def response_time(n,burst_time,quantum):
     pass
         
 
-def RR(data,quantum):
+def _first_starts(burst, quantum):
+    # everything arrives at 0 and round one goes in index order: process i first
+    # runs after every earlier process has had its first slice
+    import numpy as np
+    first_slice = np.clip(np.asarray(burst), 0, quantum)
+    return np.concatenate(([0], np.cumsum(first_slice)[:-1]))
+
+def _attach(out, data, burst, turnaround, quantum):
+    # per_process columns and tail metrics for the arrival-at-0 engines
+    import numpy as np
+    from metrics import per_process as _per_process, summary
+    frame = _per_process(np.asarray(data['process_id']), np.zeros(len(burst), dtype=np.int64),
+                         burst, turnaround, _first_starts(burst, quantum))
+    out["processes"] = frame
+    out.update(summary(frame))
+    return out
+
+def RR(data,quantum,per_process=False):
+    # per_process: also return per-process results (metrics.per_process) under "processes"
     processes = data['process_id']
     burst_time = data['burst_time']
     n = len(processes)
     waiting_t = [0] * n
     turn_around_t = [0] * n
     
-    waiting_time(processes, n, burst_time, waiting_t, quantum)
+    ilb = waiting_time(processes, n, burst_time, waiting_t, quantum)
     turnaround_time(processes, n, burst_time, waiting_t, turn_around_t,quantum)
 
     total_waiting_time = sum(waiting_t)
@@ -58,10 +79,122 @@ def RR(data,quantum):
     average_waiting_time = total_waiting_time/n
     average_turnarounf_time = total_run_around_t/n
 
-    return{
+    out = {
         'n':str(n),
         'awt': "%.4f" % average_waiting_time,
         'avtat':"%.4f" % average_turnarounf_time,
         'ilb':ilb
     }
+    if per_process and n:
+        out = _attach(out, data, list(burst_time), turn_around_t, quantum)
+    return out
+
+def RR_batch(jobs, workers=None, engine=None):
+    # run many (data, quantum) jobs on a thread pool, results in job order. Jobs may
+    # share the same data: engines only read it. RR is pure Python, so it only runs in
+    # parallel on a free-threaded build; RR_vectorized releases the GIL inside numpy.
+    #   RR_batch([(df, q) for q in range(1, 11)], workers=8)
+    from concurrent.futures import ThreadPoolExecutor
+    engine = engine or RR
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda job: engine(*job), jobs))
+
+
+def _count_prior_greater(keys, bits):
+    # for every i: how many j < i have keys[j] > keys[i]
+    # keys are dense ranks in [0, 2**bits). Bits are checked MSB first: at bit b the
+    # elements are stably sorted by their higher bits (key >> (b+1)), so each group of
+    # equal higher bits sits together in original order and a 0 at bit b is smaller
+    # than every 1 before it in its group. One radix sort + O(n) numpy work per bit.
+    import numpy as np
+    n = len(keys)
+    idx = np.int32 if n < 2**31 else np.int64
+    keys = keys.astype(idx)
+    out = np.zeros(n, dtype=np.int64)
+    pos = np.arange(n, dtype=idx)
+
+    for b in range(bits - 1, -1, -1):
+        perm = None
+        k = keys
+        if b + 1 < bits:
+            high = keys >> (b + 1)
+            perm = np.argsort(high.astype(np.uint16) if high.max() < 1 << 16 else high, kind='stable').astype(idx)
+            k = keys[perm]
+        h = k >> (b + 1)
+        bit = (k >> b) & 1
+
+        new_grp = np.empty(n, dtype=bool)
+        new_grp[0] = True
+        np.not_equal(h[1:], h[:-1], out=new_grp[1:])
+        grp_start = np.maximum.accumulate(np.where(new_grp, pos, 0))
+
+        ones_before = np.cumsum(bit, dtype=idx)
+        ones_before -= bit
+        grp_ones = ones_before - ones_before[grp_start]
+        grp_ones[bit == 1] = 0
+        if perm is None:
+            out += grp_ones
+        else:
+            out[perm] += grp_ones
+
+    return out
+
 
+def RR_vectorized(data, quantum, per_process=False):
+    # same result as RR() (every process arrives at t = 0, served in index order)
+    # but in closed form: process i needs r_i = ceil(b_i / q) rounds and finishes at
+    #   T(r_i - 1)                                 every process served in the full rounds before
+    # + q * #{j < i : r_j > r_i}                   earlier processes still running after round r_i
+    # + sum {b_j - (r_i-1)q : j <= i, r_j == r_i}  earlier processes finishing in round r_i, and i itself
+    # with T(k) = sum_j min(b_j, k*q) taken from the sorted bursts and their prefix sums
+    import numpy as np
+    burst = np.asarray(data['burst_time'])
+    n = len(burst)
+    if n == 0:
+        return {'n': '0', 'awt': "%.4f" % 0, 'avtat': "%.4f" % 0, 'ilb': 0}
+    if not np.issubdtype(burst.dtype, np.integer):
+        burst = burst.astype(np.float64)
+    else:
+        burst = burst.astype(np.int64)
+
+    rounds = np.ceil(burst / quantum).astype(np.int64) if burst.dtype.kind == 'f' else -(-burst // quantum)
+    rounds[burst <= 0] = 0
+
+    uniq, dense = np.unique(rounds, return_inverse=True)
+    dense = dense.reshape(-1)
+    full = (rounds - 1) * quantum
+
+    # T(r - 1) once per distinct round count
+    sorted_b = np.sort(burst)
+    prefix = np.concatenate(([0], np.cumsum(sorted_b)))
+    uniq_full = (uniq - 1) * quantum
+    k = np.searchsorted(sorted_b, uniq_full, side='right')
+    before = (prefix[k] + uniq_full * (n - k))[dense]
+
+    # earlier processes that are still alive after round r_i
+    bits = max(1, int(len(uniq) - 1).bit_length())
+    greater = _count_prior_greater(dense, bits)
+
+    # earlier processes of the same round (and i itself): prefix sums in (round, index) order
+    order = np.argsort(dense.astype(np.uint16) if len(uniq) <= 1 << 16 else dense, kind='stable')
+    csum = np.cumsum((burst - full)[order])
+    grp_first = np.concatenate(([0], np.cumsum(np.bincount(dense))[:-1]))
+    same = np.empty_like(csum)
+    same[order] = csum - np.concatenate(([0], csum))[grp_first[dense[order]]]
+
+    finish = before + quantum * greater + same
+    waiting_t = np.where(rounds > 0, finish - burst, 0)
+
+    ilb_run = -waiting_t[waiting_t < 0].sum().item()
+    waiting_t = np.maximum(waiting_t, 0)
+    turn_around_t = burst + waiting_t
+
+    out = {
+        'n':str(n),
+        'awt': "%.4f" % (waiting_t.sum()/n),
+        'avtat':"%.4f" % (turn_around_t.sum()/n),
+        'ilb':ilb_run
+    }
+    if per_process:
+        out = _attach(out, data, burst, turn_around_t, quantum)
+    return out
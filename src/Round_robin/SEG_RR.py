@@ -0,0 +1,457 @@
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+from hooks import bind
+
+class Proc:
+    __slots__ = ("pid", "arrival", "burst", "start", "complete", "remain", "end")
+
+    def __init__ (self,pid,arrival,burst,start = None,complete = None):
+        self.pid = pid
+        self.arrival = arrival
+        self.burst = burst
+        self.start = start
+        self.complete = complete
+        self.remain = self.burst
+        self.end = None
+
+class Cancelled(Exception):
+    pass
+
+class Segment:
+    __slots__ = ("pid", "start", "end", "kind")
+
+    def __init__(self,pid,start,end,kind):
+        self.pid = pid
+        self.start = start
+        self.end = end
+        self.kind = kind
+
+KINDS = ('run', 'idle', 'cs')
+RUN, IDLE, CS = range(3)
+
+class SegmentLog:
+    # the schedule as parallel typed arrays: pid code, start, end, kind code (KINDS).
+    # About 21 bytes per segment instead of a Segment object each; PIDs are interned
+    # in `pids` (code -1 = no process); the table only grows, so slices and copies share
+    # it. log[k] builds a Segment on demand, log[a:b] is a new log. With merge=True a slice that directly continues the previous slice of
+    # the same PID (it was the only one ready) extends that segment instead.
+    # Times are integers.
+    def __init__(self, merge=False):
+        self.merge = merge
+        self.code = array('i')
+        self.start = array('q')
+        self.end = array('q')
+        self.kind = array('b')
+        self.pids = []
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.code)
+
+    def intern(self, pid):
+        if pid is None:
+            return -1
+        c = self.codes.get(pid)
+        if c is None:
+            c = self.codes[pid] = len(self.pids)
+            self.pids.append(pid)
+        return c
+
+    def append(self, pid, start, end, kind):
+        c = self.intern(pid)
+        if self.merge and kind == RUN and self.code and self.code[-1] == c \
+                and self.kind[-1] == RUN and self.end[-1] == start:
+            self.end[-1] = end
+            return
+        self.code.append(c)
+        self.start.append(start)
+        self.end.append(end)
+        self.kind.append(kind)
+
+    def pid_at(self, k):
+        c = self.code[k]
+        return self.pids[c] if c >= 0 else None
+
+    def kind_at(self, k):
+        return KINDS[self.kind[k]]
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            part = SegmentLog(self.merge)
+            part.code, part.start, part.end, part.kind = self.code[k], self.start[k], self.end[k], self.kind[k]
+            part.pids, part.codes = self.pids, self.codes
+            return part
+        return Segment(self.pid_at(k), self.start[k], self.end[k], KINDS[self.kind[k]])
+
+    def __iter__(self):
+        pids = self.pids
+        for c, s, e, k in zip(self.code, self.start, self.end, self.kind):
+            yield Segment(pids[c] if c >= 0 else None, s, e, KINDS[k])
+
+    def __delitem__(self, k):
+        # only tails (del log[k:]), used to roll back to a checkpoint
+        del self.code[k], self.start[k], self.end[k], self.kind[k]
+
+    def extend(self, other):
+        # another log: a batch sliced from the same log shares its pid table
+        if isinstance(other, SegmentLog):
+            if not self.pids:
+                self.pids, self.codes = other.pids, other.codes
+            if other.pids is self.pids:
+                self.code.extend(other.code)
+            else:
+                remap = [self.intern(pid) for pid in other.pids]
+                self.code.extend(remap[c] if c >= 0 else -1 for c in other.code)
+            self.start.extend(other.start)
+            self.end.extend(other.end)
+            self.kind.extend(other.kind)
+        else:
+            for seg in other:
+                self.append(seg.pid, seg.start, seg.end, KINDS.index(seg.kind))
+
+    def copy(self):
+        return self[:]
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.code, self.start, self.end, self.kind))
+
+class Checkpoint:
+    # simulation state at the top of the loop: everything that arrived before `time`
+    # is either finished (final, never touched again) or in `ready`
+    def __init__(self,time,i,ready,seg_idx,total_runtime,left,last_end=None):
+        self.time = time
+        self.i = i                      # arrivals[:i] have been flushed
+        self.ready = ready              # (procs in queue order, their remain, their start)
+        self.seg_idx = seg_idx
+        self.last_end = last_end        # end of segment seg_idx-1 then (a merge may extend it later)
+        self.total_runtime = total_runtime
+        self.left = left
+
+def _simulate(arrivals, procs, quantum, cs, time, i, ready, segments, total_runtime, left,
+              on_batch=None, cancel=None, batch_size=4096, checkpoints=None, every=1024, hooks=None):
+    on_arrival, on_start, on_end, on_done, on_idle, on_switch, on_phase = bind(hooks)
+    # only progress reports need it, and it is a pass over every arrival
+    total_work = (sum(p.burst for p in arrivals) or 1) if on_batch is not None else 1
+    sent = 0
+    batched = on_batch is not None or cancel is not None
+    next_ckpt = len(segments)
+    last = None         # process of the previous slice, for on_switch
+    switch = None       # (start, end) of the cs segment since that slice, if any
+
+    def flush_arrivals(upto_time):
+        nonlocal i, ready # use directly index and ready in function
+        if on_phase: on_phase("admit")
+        while i < len(arrivals) and arrivals[i].arrival <= upto_time:
+            ready.append(arrivals[i])
+            if on_arrival: on_arrival(arrivals[i].arrival, arrivals[i].pid)
+            i += 1 #add arrival time of process
+
+    flush_arrivals(time)
+
+    while True:
+        if checkpoints is not None and len(segments) >= next_ckpt:
+            queued = list(ready)
+            checkpoints.append(Checkpoint(time, i, (queued, [p.remain for p in queued], [p.start for p in queued]),
+                                          len(segments), total_runtime, left,
+                                          segments.end[-1] if len(segments) else None))
+            # copying the queue costs O(len(ready)): space checkpoints at least that far apart
+            next_ckpt = len(segments) + max(every, len(queued))
+
+        if left == 0:
+            break # ALL DONE
+
+        if not ready:
+            if i < len(arrivals):
+                next_t = arrivals[i].arrival
+                if next_t > time:
+                    segments.append(None, time, next_t, IDLE)
+                    if on_idle: on_idle(time, next_t)
+                    time = next_t
+                flush_arrivals(time)
+            else:   
+                break
+
+        if not ready:
+            continue
+
+        if on_phase: on_phase("run")
+        p = ready.popleft()
+        if on_switch:
+            # a switch is a change of process, as in RR_algorithm: a cs segment before
+            # the same process again is not one, and without cs the switch takes no time
+            if last is not None and p is not last:
+                on_switch(*(switch or (time, time)))
+            last, switch = p, None
+        if on_start: on_start(time, p.pid, len(ready))
+
+        if p.start is None:
+            p.start = time
+        
+        slice_len = min(quantum,p.remain)
+        seg_start = time
+        seg_end = time + slice_len
+        segments.append(p.pid, seg_start, seg_end, RUN)
+        total_runtime += slice_len
+        time = seg_end
+        p.remain -= slice_len
+        if on_end: on_end(time, p.pid, p.remain)
+
+        flush_arrivals(time)
+
+        if p.remain > 0:
+            ready.append(p)
+        else:
+            p.end = time
+            if on_done: on_done(time, p.pid)
+            if slice_len > 0 and procs[p.pid] is p:
+                left -= 1
+
+        if cs > 0 and left > 0:
+            segments.append(None, time, time + cs, CS)
+            switch = (time, time + cs)
+            time += cs
+            flush_arrivals(time)
+
+        if batched and len(segments) - sent >= batch_size:
+            if cancel is not None and cancel.is_set():
+                raise Cancelled()
+            # a merging log may still extend its last segment: keep it for the next batch
+            upto = len(segments) - 1 if segments.merge else len(segments)
+            if on_batch is not None:
+                on_batch(segments[sent:upto], total_runtime / total_work)
+            sent = upto
+
+    if on_batch is not None:
+        on_batch(segments[sent:], 1.0)
+    return total_runtime
+
+def _summarize(processes, procs, segments, total_runtime, per_process=False):
+    makespan = segments.end[-1] if len(segments) else 0
+
+    if per_process:
+        from metrics import per_process as _per_process, summary
+        ps = list(procs.values())
+        stats = _per_process([p.pid for p in ps], [p.arrival for p in ps], [p.burst for p in ps],
+                             [p.end for p in ps], [p.arrival if p.start is None else p.start for p in ps])
+        totals = dict(
+            avg_wt = float(stats["waiting"].mean()) if len(ps) else 0.0,
+            avg_tat = float(stats["turnaround"].mean()) if len(ps) else 0.0,
+            throughput = (len(processes)/makespan) if makespan>0 else 0.0,
+            cpu_util = (total_runtime/makespan*100.0) if makespan>0 else 0.0,
+            makespan = makespan
+        )
+        totals.update(summary(stats))
+        return stats, totals
+
+    stats = {}
+    for pid, p in procs.items():
+        ct = p.end 
+        tat = ct - p.arrival
+        wt = tat - p.burst
+        rt = (p.start - p.arrival) if p.start is not None else 0
+        stats[pid] = dict(CT = ct, WT=wt, TAT = tat,RT = rt)
+
+    totals = dict(
+        avg_wt = sum(s["WT"] for s in stats.values())/len(stats) if stats else 0.0,
+        avg_tat = sum(s["TAT"] for s in stats.values())/len(stats) if stats else 0.0,
+        throughput = (len(processes)/makespan) if makespan>0 else 0.0,
+        cpu_util = (total_runtime/makespan*100.0) if makespan>0 else 0.0,
+        makespan = makespan
+    )
+    return stats, totals
+
+def CalculateRR(processes, quantum,cs, on_batch=None, cancel=None, batch_size=4096, per_process=False, hooks=None,
+                merge=False):
+    # on_batch(new_segments, progress) is called every batch_size segments (progress =
+    # share of the total burst time done); cancel is checked at the same points
+    # (anything with is_set(), e.g. threading.Event) and raises Cancelled.
+    # per_process: stats is a metrics.per_process DataFrame instead of a dict per PID,
+    # and totals also get the tail metrics of metrics.summary
+    # hooks: hooks.Observer instances, see hooks.EVENTS
+    # segments come back as a SegmentLog; merge: join back-to-back slices of one PID
+    on_phase = bind(hooks)[-1]
+    if on_phase: on_phase("setup")
+    procs = {p.pid: p for p in processes}
+    arrivals = sorted(processes,key=lambda p: p.arrival)
+    # To sort on arrival time 
+
+    segments = SegmentLog(merge)
+
+    # processes (as seen in procs) that still need CPU, kept up to date on every
+    # completion instead of scanning all processes on every slice
+    left = sum(1 for p in procs.values() if p.remain > 0)
+
+    total_runtime = _simulate(arrivals, procs, quantum, cs, 0, 0, deque(), segments, 0, left,
+                              on_batch, cancel, batch_size, hooks=hooks)
+    if on_phase: on_phase("summary")
+    stats, totals = _summarize(processes, procs, segments, total_runtime, per_process)
+    if on_phase: on_phase("done")
+    return segments, stats, totals
+
+
+class IncrementalRR:
+    # CalculateRR that remembers a checkpoint every `every` segments. After add()/remove()
+    # of processes arriving at a or later, run() restarts from the last checkpoint taken
+    # before a instead of t = 0. PIDs must be unique.
+    def __init__(self, processes, quantum, cs, every=1024, merge=False):
+        self.quantum = quantum
+        self.merge = merge
+        self.cs = cs
+        self.every = every
+        self.processes = list(processes)
+        self.procs = {}
+        for p in self.processes:
+            if p.pid in self.procs:
+                raise ValueError(f"duplicate PID {p.pid!r}")
+            self.procs[p.pid] = p
+        self.arrivals = sorted(self.processes, key=lambda p: p.arrival)
+        self.arrival_keys = [p.arrival for p in self.arrivals]
+        self.segments = SegmentLog(merge)
+        self.checkpoints: list[Checkpoint] = []
+        self.total_runtime = 0
+        self.changed_from = None    # earliest arrival touched since the last run
+        self.delta_left = 0         # change of the `left` counter since the last run
+        self.resumed_at = None      # time of the checkpoint the last run started from
+        self.stats = dict.fromkeys(self.procs)     # pid -> CT/WT/TAT/RT as _summarize gives them
+        self.sum_wt = self.sum_tat = 0
+        self.stale = None           # processes the last run may have changed (None: all)
+
+    def add(self, proc):
+        if proc.pid in self.procs:
+            raise ValueError(f"duplicate PID {proc.pid!r}")
+        k = bisect_right(self.arrival_keys, proc.arrival)
+        self.arrivals.insert(k, proc)
+        self.arrival_keys.insert(k, proc.arrival)
+        self.processes.append(proc)
+        self.procs[proc.pid] = proc
+        self.stats[proc.pid] = None     # filled in by result(), in procs order
+        self._touch(proc, +1)
+
+    def extend(self, procs):
+        # add() for many processes at once: one sort of the new ones and one merge,
+        # O(n + m log m) instead of a list insert per process
+        procs = list(procs)
+        seen = set()
+        for proc in procs:
+            if proc.pid in self.procs or proc.pid in seen:
+                raise ValueError(f"duplicate PID {proc.pid!r}")
+            seen.add(proc.pid)
+        # ties keep add()'s order: existing processes first, then the new ones as given
+        new = sorted(procs, key=lambda p: p.arrival)
+        self.arrivals = list(heapq.merge(self.arrivals, new, key=lambda p: p.arrival))
+        self.arrival_keys = [p.arrival for p in self.arrivals]
+        for proc in procs:
+            self.processes.append(proc)
+            self.procs[proc.pid] = proc
+            self.stats[proc.pid] = None
+            self._touch(proc, +1)
+
+    def remove(self, pid):
+        proc = self.procs.pop(pid)
+        k = bisect_left(self.arrival_keys, proc.arrival)
+        while self.arrivals[k] is not proc:
+            k += 1
+        del self.arrivals[k]
+        del self.arrival_keys[k]
+        self.processes.remove(proc)
+        old = self.stats.pop(pid)
+        if old is not None:
+            self.sum_wt -= old["WT"]
+            self.sum_tat -= old["TAT"]
+        self._touch(proc, -1)
+
+    def _touch(self, proc, sign):
+        if self.changed_from is None or proc.arrival < self.changed_from:
+            self.changed_from = proc.arrival
+        if proc.burst > 0:
+            self.delta_left += sign
+
+    def _restart_point(self):
+        # last checkpoint before the earliest change. Every decision taken before it must
+        # see the same `left > 0` with and without the change: `left` only goes down, so
+        # checking the checkpoint itself is enough.
+        if self.changed_from is None and self.segments:
+            return None
+        k = len(self.checkpoints)
+        if self.changed_from is not None:
+            k = bisect_left([c.time for c in self.checkpoints], self.changed_from)
+        while k > 0:
+            c = self.checkpoints[k - 1]
+            if c.left >= 1 and c.left + self.delta_left >= 1:
+                return k - 1
+            k -= 1
+        return -1
+
+    def run(self, on_batch=None, cancel=None, batch_size=4096):
+        k = self._restart_point()
+        if k is None:
+            # nothing changed since the last run
+            if on_batch is not None:
+                on_batch(self.segments[:], 1.0)
+            return self.result()
+
+        if k < 0:
+            for p in self.processes:
+                p.remain, p.start, p.end = p.burst, None, None
+            self.segments, self.checkpoints = SegmentLog(self.merge), []
+            time, i, ready, total_runtime = 0, 0, deque(), 0
+            left = sum(1 for p in self.processes if p.remain > 0)
+            self.stale = None
+        else:
+            c = self.checkpoints[k]
+            for p in self.arrivals[c.i:]:
+                p.remain, p.start, p.end = p.burst, None, None
+            queued, remains, starts = c.ready
+            for p, remain, start in zip(queued, remains, starts):
+                p.remain, p.start, p.end = remain, start, None
+            for kept in self.checkpoints[:k]:
+                kept.left += self.delta_left
+            del self.segments[c.seg_idx:]
+            if c.seg_idx:
+                self.segments.end[-1] = c.last_end
+            del self.checkpoints[k:]
+            time, i, ready, total_runtime = c.time, c.i, deque(queued), c.total_runtime
+            left = c.left + self.delta_left
+            # everything that finished before the checkpoint keeps its stats
+            self.stale = self.arrivals[c.i:] + queued
+        self.resumed_at = time
+
+        # a cancelled run leaves the state half-done: start over next time
+        self.changed_from, self.delta_left = -1, 0
+        self.total_runtime = _simulate(self.arrivals, self.procs, self.quantum, self.cs, time, i, ready,
+                                       self.segments, total_runtime, left, on_batch, cancel, batch_size,
+                                       self.checkpoints, self.every)
+        self.changed_from = None
+        return self.result()
+
+    def result(self):
+        # _summarize's stats and totals, recomputed only for the processes the last run
+        # could have changed; the averages come from running sums
+        stale = self.procs.values() if self.stale is None else self.stale
+        for p in stale:
+            old = self.stats.get(p.pid)
+            if old is not None:
+                self.sum_wt -= old["WT"]
+                self.sum_tat -= old["TAT"]
+            tat = p.end - p.arrival
+            wt = tat - p.burst
+            rt = (p.start - p.arrival) if p.start is not None else 0
+            self.stats[p.pid] = dict(CT = p.end, WT=wt, TAT = tat,RT = rt)
+            self.sum_wt += wt
+            self.sum_tat += tat
+        self.stale = []
+
+        n = len(self.stats)
+        makespan = self.segments.end[-1] if len(self.segments) else 0
+        totals = dict(
+            avg_wt = self.sum_wt/n if n else 0.0,
+            avg_tat = self.sum_tat/n if n else 0.0,
+            throughput = (len(self.processes)/makespan) if makespan>0 else 0.0,
+            cpu_util = (self.total_runtime/makespan*100.0) if makespan>0 else 0.0,
+            makespan = makespan
+        )
+        # a copy of the table only (entries are replaced, never changed): callers keep results
+        return self.segments, dict(self.stats), totals
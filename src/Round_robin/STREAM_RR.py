@@ -0,0 +1,126 @@
+import csv
+from collections import deque
+
+from metrics import StreamSummary
+
+# a live process: [pid, arrival, burst, remain, first start]
+PID, ARRIVAL, BURST, REMAIN, START = range(5)
+
+
+def read_trace(path, chunksize=1 << 16):
+    # (pid, arrival, burst) rows of a data_set.csv-style trace (or .rrw workload file),
+    # sorted by arrival, read chunk by chunk so the whole file is never in memory
+    from workload import SUFFIX, iter_workload
+    if str(path).endswith(SUFFIX):
+        yield from iter_workload(path, chunksize)
+        return
+    import pandas as pd
+    for chunk in pd.read_csv(path, usecols=["process_id", "arrival_time", "burst_time"], chunksize=chunksize):
+        yield from zip(chunk["process_id"].tolist(), chunk["arrival_time"].tolist(), chunk["burst_time"].tolist())
+
+def _skip_rounds(ready, t, next_arrival, quantum):
+    # k full rounds keep the queue order as it is, as long as nobody finishes
+    # (every remain > k*quantum) and nothing arrives before the last slice ends
+    m = len(ready)
+    k = (min(p[REMAIN] for p in ready) - 1) // quantum
+    if next_arrival is not None:
+        k_arr = (next_arrival - t) // (m * quantum)
+        if t + k_arr * m * quantum >= next_arrival:
+            k_arr -= 1
+        k = min(k, k_arr)
+    if k <= 0:
+        return t
+    for j, p in enumerate(ready):
+        if p[START] is None:
+            p[START] = t + j * quantum
+    for p in ready:
+        p[REMAIN] -= k * quantum
+    return t + k * m * quantum
+
+def RR_stream(arrivals, quantum, skip_rounds=False):
+    # RR_algorithm over an iterator of (pid, arrival, burst) sorted by arrival.
+    # Yields (pid, arrival, burst, finish, turnaround, waiting, response) as processes complete;
+    # only the processes currently in the ready queue are kept in memory.
+    arrivals = iter(arrivals)
+    nxt = next(arrivals, None)
+    last_arrival = None
+    ready = deque()
+    t = 0
+    since_skip = 0
+
+    def admit(upto):
+        nonlocal nxt, last_arrival
+        while nxt is not None and nxt[1] <= upto:
+            if last_arrival is not None and nxt[1] < last_arrival:
+                raise ValueError(f"trace is not sorted by arrival_time at process {nxt[0]}")
+            last_arrival = nxt[1]
+            ready.append([nxt[0], nxt[1], nxt[2], nxt[2], None])
+            nxt = next(arrivals, None)
+
+    if nxt is not None and t < nxt[1]:
+        t = nxt[1]
+    admit(t)
+
+    while ready or nxt is not None:
+        if not ready:
+            t = max(t, nxt[1])
+            admit(t)
+            continue
+
+        if skip_rounds and since_skip >= len(ready):
+            since_skip = 0
+            t = _skip_rounds(ready, t, nxt[1] if nxt is not None else None, quantum)
+
+        p = ready.popleft()
+        since_skip += 1
+        if p[START] is None:
+            p[START] = t
+        run = min(quantum, p[REMAIN])
+        t += run
+        p[REMAIN] -= run
+
+        admit(t)
+
+        if p[REMAIN] == 0:
+            turnaround = t - p[ARRIVAL]
+            yield (p[PID], p[ARRIVAL], p[BURST], t, turnaround, turnaround - p[BURST], p[START] - p[ARRIVAL])
+        else:
+            ready.append(p)
+
+def RR_stream_file(trace, quantum, out_path=None, skip_rounds=False):
+    # stream a trace (path or iterator of rows) through RR_stream, optionally writing the
+    # per-process results to out_path as they come; returns RR_algorithm's summary dict
+    # plus the tail metrics of metrics.summary, estimated in bounded memory
+    rows = read_trace(trace) if isinstance(trace, (str, bytes)) or hasattr(trace, "__fspath__") else trace
+    n = 0
+    total_wait = 0
+    total_turn = 0
+    t = 0
+    tails = StreamSummary()
+
+    out = open(out_path, "w", newline="") if out_path else None
+    try:
+        writer = None
+        if out:
+            writer = csv.writer(out)
+            writer.writerow(["process_id", "arrival_time", "burst_time", "finish_time", "turnaround", "waiting", "response"])
+        for row in RR_stream(rows, quantum, skip_rounds):
+            n += 1
+            total_turn += row[4]
+            total_wait += row[5]
+            t = max(t, row[3])
+            tails.add(row[2], row[4], row[5], row[6])
+            if writer:
+                writer.writerow(row)
+    finally:
+        if out:
+            out.close()
+
+    result = {
+        "n":n,
+        "avg_waiting": f"{total_wait/n:.4f}",
+        "avg_turn": f"{total_turn/n:.4f}",
+        "time": f"{t}"
+    }
+    result.update(tails.result())
+    return result
@@ -0,0 +1,253 @@
+import argparse
+import gc
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from Round_robin.RR import RR, RR_batch, RR_vectorized
+from Round_robin.CO_RR import RR_algorithm
+from Round_robin.PRIO_RR import PRIO_RR
+from Round_robin.MULTI_RR import MultiRR
+from Round_robin.SEG_RR import Proc, CalculateRR, RUN
+from initializing_process import make_workload
+from hooks import Observer, PhaseProfiler, QueueLengthHistogram, SwitchCounter
+
+
+def make_procs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    arrival = np.sort(rng.integers(0, max(1, n), size=n))
+    burst = rng.integers(1, 10, size=n)
+    return [Proc(f"P{k+1}", int(arrival[k]), int(burst[k])) for k in range(n)]
+
+def bench_calculate_rr(sizes=(1000, 2000, 4000, 8000, 16000), quantum=3, cs=1):
+    # CalculateRR should cost O(slices): slices/s has to stay flat as n grows
+    rows = []
+    for n in sizes:
+        procs = make_procs(n)
+        start = time.perf_counter()
+        segments, stats, totals = CalculateRR(procs, quantum, cs)
+        elapsed = time.perf_counter() - start
+        slices = segments.kind.count(RUN)
+        rows.append(dict(n=n, slices=slices, seconds=elapsed, slices_per_s=slices / elapsed))
+    return rows
+
+
+# every engine: (prepare(workload) -> args, run(args, quantum, cs), supports cs)
+def _frame(w):
+    return pd.DataFrame(w)
+
+def _procs(w):
+    return [Proc(int(p), int(a), int(b)) for p, a, b in zip(w["process_id"], w["arrival_time"], w["burst_time"])]
+
+ENGINES = {
+    "RR":               (_frame, lambda d, q, cs: RR(d, q), False),
+    "RR_vectorized":    (_frame, lambda d, q, cs: RR_vectorized(d, q), False),
+    "RR_algorithm":     (_frame, lambda d, q, cs: RR_algorithm(d, q), False),
+    "RR_algorithm_skip": (_frame, lambda d, q, cs: RR_algorithm(d, q, skip_rounds=True), False),
+    "PRIO_RR":          (_frame, lambda d, q, cs: PRIO_RR(d, q), False),
+    "MultiRR_64":       (_frame, lambda d, q, cs: MultiRR(d, q, 64), False),
+    "CalculateRR":      (_procs, lambda p, q, cs: CalculateRR(p, q, cs), True),
+}
+
+# RR() rescans all n processes on every pass: skip points above this many n * passes
+RR_MAX_WORK = 10**7
+
+
+def _measure(engine, workload, quantum, cs, repeat):
+    prepare, run, _ = ENGINES[engine]
+    best = float("inf")
+    for _ in range(repeat):
+        args = prepare(workload)     # CalculateRR consumes its Proc objects
+        start = time.perf_counter()
+        run(args, quantum, cs)
+        best = min(best, time.perf_counter() - start)
+
+    args = prepare(workload)
+    tracemalloc.start()
+    run(args, quantum, cs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+# observer sets for bench_hooks; "none" is the engine as called without hooks
+# none: no hooks argument; noop: an observer that overrides nothing, so bind() hands the
+# engine the same all-None callables; real: every collector in hooks.py
+HOOK_SETS = {
+    "none":  lambda: None,
+    "noop":  lambda: [Observer()],
+    "real":  lambda: [QueueLengthHistogram(), SwitchCounter(), PhaseProfiler()],
+}
+
+def bench_hooks(n=100000, quantum=2, cs=1, repeat=9, seed=0):
+    # cost of the observer interface against the same engine without hooks. Runs are
+    # interleaved so drift hits every set alike, and the collector is off while timing:
+    # a collection landing in one run and not another was worth 10-20% on its own.
+    # CPU time, not wall time, so other load on the machine does not count.
+    # noise is the none set's median over its best run, the floor any overhead is read against
+    workload = make_workload(n, seed=seed, rate=0.18)
+    runs = {
+        "RR_algorithm": (_frame, lambda d, hooks: RR_algorithm(d, quantum, hooks=hooks)),
+        "CalculateRR":  (_procs, lambda p, hooks: CalculateRR(p, quantum, cs, hooks=hooks)),
+    }
+    rows = []
+    for engine, (prepare, run) in runs.items():
+        times = {name: [] for name in HOOK_SETS}
+        names = list(HOOK_SETS)
+        for r in range(repeat):
+            # rotated, so no set always runs first (right after another engine's run)
+            for name in names[r % len(names):] + names[:r % len(names)]:
+                args = prepare(workload)
+                hooks = HOOK_SETS[name]()
+                gc.collect()
+                gc.disable()
+                try:
+                    start = time.process_time()
+                    run(args, hooks)
+                    times[name].append(time.process_time() - start)
+                finally:
+                    gc.enable()
+        base = min(times["none"])
+        noise = statistics.median(times["none"]) / base - 1
+        for name, seconds in times.items():
+            rows.append(dict(engine=engine, hooks=name, seconds=min(seconds),
+                             overhead=min(seconds) / base - 1, noise=noise))
+    return rows
+
+def _stress_job(data, quantum, per_process, engine):
+    # a call that trips over another thread's state may raise instead: count it as a mismatch
+    try:
+        return engine(data, quantum, per_process)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+def _diff(expected, got):
+    # first field where two results differ (per-process frames by value), None if equal
+    for key in expected.keys() | got.keys():
+        e, g = expected.get(key), got.get(key)
+        if isinstance(e, pd.DataFrame) or isinstance(g, pd.DataFrame):
+            if not (isinstance(e, pd.DataFrame) and isinstance(g, pd.DataFrame) and e.equals(g)):
+                return key
+        elif e != g:
+            return key
+    return None
+
+def stress_rr(threads=16, jobs=512, rounds=3, seed=0):
+    # RR_batch under heavy thread switching must give every job the same result as a
+    # plain sequential call. RR and RR_vectorized jobs are interleaved on the same
+    # DataFrames, most with per_process frames, so any state one call leaves behind for
+    # another (shared buffers, cached columns, a written-to input) shows up as a
+    # mismatch: (job index, engine, first differing field) are returned
+    rng = np.random.default_rng(seed)
+    workloads = [pd.DataFrame(make_workload(int(rng.integers(1, 300)), seed=k)) for k in range(8)]
+    batch = [(workloads[k % len(workloads)], int(rng.integers(1, 12)), bool(rng.random() < 0.75),
+              (RR, RR_vectorized)[int(rng.integers(2))]) for k in range(jobs)]
+    expected = [_stress_job(*job) for job in batch]
+    mismatches = []
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)     # switch threads as often as the interpreter allows
+    try:
+        for _ in range(rounds):
+            got = RR_batch(batch, workers=threads, engine=_stress_job)
+            for k, (e, g) in enumerate(zip(expected, got)):
+                field = _diff(e, g)
+                if field is not None:
+                    mismatches.append((k, batch[k][3].__name__, field))
+    finally:
+        sys.setswitchinterval(old)
+    return mismatches
+
+def run_suite(engines=tuple(ENGINES), sizes=(1000, 10000), quanta=(2, 8), bursts=("uniform", "pareto"),
+              css=(0, 1), repeat=3, seed=0):
+    rows = []
+    for engine, n, quantum, burst, cs in itertools.product(engines, sizes, quanta, bursts, css):
+        if cs and not ENGINES[engine][2]:
+            continue
+        workload = make_workload(n, seed=seed, burst=burst, rate=0.18)
+        slices = int(np.ceil(workload["burst_time"] / quantum).sum())
+        row = dict(engine=engine, n=n, quantum=quantum, burst=burst, cs=cs, slices=slices)
+        if engine == "RR" and n * int(np.ceil(workload["burst_time"].max() / quantum)) > RR_MAX_WORK:
+            rows.append(dict(row, seconds=None, peak_mb=None, slices_per_s=None, skipped=True))
+            continue
+        seconds, peak = _measure(engine, workload, quantum, cs, repeat)
+        rows.append(dict(row, seconds=seconds, peak_mb=peak / 2**20, slices_per_s=slices / seconds))
+    return rows
+
+def _key(row):
+    return (row["engine"], row["n"], row["quantum"], row["burst"], row["cs"])
+
+def save_baseline(rows, path):
+    meta = dict(python=platform.python_version(), numpy=np.__version__, machine=platform.machine(),
+                created=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    with open(path, "w") as f:
+        json.dump(dict(meta=meta, results=rows), f, indent=1)
+
+def compare(rows, path, tolerance=0.25):
+    # rows slower (or using more memory) than the baseline by more than `tolerance`
+    with open(path) as f:
+        base = {_key(r): r for r in json.load(f)["results"]}
+    regressions = []
+    for row in rows:
+        old = base.get(_key(row))
+        if not old or row["seconds"] is None or old["seconds"] is None:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            if old[metric] and row[metric] > old[metric] * (1 + tolerance):
+                regressions.append(dict(row, metric=metric, baseline=old[metric], ratio=row[metric] / old[metric]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Round Robin engines")
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--n", default="1000,10000")
+    parser.add_argument("--quantum", "-q", default="2,8")
+    parser.add_argument("--burst", default="uniform,pareto")
+    parser.add_argument("--cs", default="0,1")
+    parser.add_argument("--repeat", type=int, default=None, help="runs per case (default 3, --hooks: 9)")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--scaling", action="store_true", help="only the CalculateRR slices/s scaling check")
+    parser.add_argument("--hooks", action="store_true", help="only the observer overhead check")
+    parser.add_argument("--stress", action="store_true", help="only the RR_batch concurrency check")
+    args = parser.parse_args()
+
+    if args.stress:
+        mismatches = stress_rr()
+        for k, engine, field in mismatches[:10]:
+            print(f"job {k} ({engine}): {field!r} differs from the sequential run")
+        print(f"{len(mismatches)} mismatching results")
+        sys.exit(1 if mismatches else 0)
+
+    if args.hooks:
+        table = pd.DataFrame(bench_hooks(repeat=args.repeat or 9))
+        for col in ("overhead", "noise"):
+            table[col] = table[col].map("{:+.1%}".format)
+        print(table.to_string(index=False))
+        sys.exit(0)
+
+    if args.scaling:
+        for row in bench_calculate_rr():
+            print(f"n={row['n']:>7}  slices={row['slices']:>8}  {row['seconds']:.3f}s  {row['slices_per_s']:,.0f} slices/s")
+        sys.exit(0)
+
+    ints = lambda text: [int(x) for x in text.split(",")]
+    rows = run_suite(args.engines.split(","), ints(args.n), ints(args.quantum),
+                     args.burst.split(","), ints(args.cs), args.repeat or 3)
+    print(pd.DataFrame(rows).to_string(index=False))
+
+    if args.save:
+        save_baseline(rows, args.save)
+    if args.compare:
+        regressions = compare(rows, args.compare, args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['engine']} n={r['n']} q={r['quantum']} {r['burst']} cs={r['cs']}: "
+                  f"{r['metric']} {r['ratio']:.2f}x baseline")
+        sys.exit(1 if regressions else 0)
@@ -1,108 +1,19 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox
-from collections import deque
 import tkinter as tk
+from bisect import bisect_left, bisect_right
+import time
+import threading
+import queue
 from initializing_process import seg_initializing
+from Round_robin.SEG_RR import Proc, CalculateRR, Cancelled, IncrementalRR, SegmentLog, RUN, CS
+from functools import partial
+from result_cache import DEFAULT_DIR, ResultCache, procs_hash, result_key
+from quantum_search import find_best_quantum
+from result_table import COLUMNS, ResultTable
 
 ctk.set_appearance_mode("dark")
 
-class Proc:
-    def __init__ (self,pid,arrival,burst,start = None,complete = None):
-        self.pid = pid
-        self.arrival = arrival
-        self.burst = burst
-        self.start = start
-        self.complete = complete
-        self.remain = self.burst
-
-class Segment:
-    def __init__(self,pid,start,end,kind):
-        self.pid = pid
-        self.start = start
-        self.end = end
-        self.kind = kind
-
-def CalculateRR(processes, quantum,cs):
-    procs = {p.pid: p for p in processes}
-    arrivals = sorted(processes,key=lambda p: p.arrival)
-    # To sort on arrival time 
-
-    time = 0
-    i = 0
-    ready = deque()
-    segments: list[Segment] = []
-    total_runtime = 0
-
-    def flush_arrivals(upto_time):
-        nonlocal i, ready # use directly index and ready in function
-        while i < len(arrivals) and arrivals[i].arrival <= upto_time:
-            ready.append(arrivals[i])
-            i += 1 #add arrival time of process
-
-    flush_arrivals(time)
-
-    while True:
-        if all(p.remain == 0 for p in procs.values()):
-            break # ALL DONE
-
-        if not ready:
-            if i < len(arrivals):
-                next_t = arrivals[i].arrival
-                if next_t > time:
-                    segments.append(Segment(None, time,next_t,'idle'))
-                    time = next_t
-                flush_arrivals(time)
-            else:   
-                break
-
-        if not ready:
-            continue
-
-        p = ready.popleft()
-
-        if p.start is None:
-            p.start = time
-        
-        slice_len = min(quantum,p.remain)
-        seg_start = time
-        seg_end = time + slice_len
-        segments.append(Segment(p.pid,seg_start,seg_end,'run'))
-        total_runtime += slice_len
-        time = seg_end
-        p.remain -= slice_len
-
-        flush_arrivals(time)
-
-        if p.remain > 0:
-            ready.append(p)
-        else:
-            p.end = time
-        
-        more_head = any(q.remain > 0 for q in procs.values())
-        if cs > 0 and more_head:
-            segments.append(Segment(None,time,time + cs, 'cs'))
-            time += cs
-            flush_arrivals(time)
-    makespan = segments[-1].end if segments else 0
-
-    stats = {}
-    for pid, p in procs.items():
-        ct = p.end 
-        tat = ct - p.arrival
-        wt = tat - p.burst
-        rt = (p.start - p.arrival) if p.start is not None else 0
-        stats[pid] = dict(CT = ct, WT=wt, TAT = tat,RT = rt)
-
-    totals = dict(
-        avg_wt = sum(s["WT"] for s in stats.values())/len(stats) if stats else 0.0,
-        avg_tat = sum(s["TAT"] for s in stats.values())/len(stats) if stats else 0.0,
-        throughput = (len(processes)/makespan) if makespan>0 else 0.0,
-        cpu_util = (total_runtime/makespan*100.0) if makespan>0 else 0.0,
-        makespan = makespan
-    )
-    return segments, stats, totals
-
-
 class App(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -112,13 +23,31 @@ class App(ctk.CTk):
         # self._set_appearance_mode("dark")
 
         self.processes: list[Proc] = []
-        self.segments: list[Segment] = []
+        self.segments = SegmentLog()     # seg_starts/seg_ends are its start/end arrays
         self.stats: dict = {}
         self.totals: dict = {}
         self.anim_idx = 0
         self.animating = False
         self.scale_px = 70
         self.row_height = 80
+        self.makespan = 0
+        self.seg_starts = self.segments.start
+        self.seg_ends = self.segments.end
+        self.render_pending = False
+        self.lod = False
+        self.anim_t0 = 0.0
+        self.anim_base = 0
+        self.computing = False
+        self.cancel_event = None
+        self.results = queue.Queue()
+        self.session = None         # IncrementalRR of the last Run, kept in sync with edits
+        self.session_key = None     # (quantum, cs) it was built for
+        self.table = ResultTable([], [], [], [], [])
+        self.tbl_top = 0            # first table position on screen
+        self.tbl_rows = 0           # Treeview rows that fit, the only ones ever inserted
+        self.tbl_sort = ("pid", False)
+        self.tbl_mark = None        # table row (not position) picked by jump-to-PID
+        self.cache = ResultCache(maxsize=8, path=DEFAULT_DIR)
         self.colors = {}
         self.palette = [
             "#4CC9F0", "#F72585", "#7209B7", "#3A0CA3", "#4361EE",
@@ -230,12 +159,13 @@ class App(ctk.CTk):
         self.sp_cs = tk.Spinbox(r1, from_=0, to=20, width=6)
         self.sp_cs.delete(0, tk.END); self.sp_cs.insert(0, "0")
         self.sp_cs.pack(side=tk.LEFT, padx=(6,0))
+        ctk.CTkButton(r1, text="Best q", width=60, command=self.best_quantum).pack(side=tk.LEFT, padx=(14,0))
 
         r2 = ctk.CTkFrame(cf)
         r2.configure(fg_color="#0F0E0E")
         r2.pack(fill=tk.X, padx=6, pady=4)
-        ctk.CTkLabel(r2, text="Tốc độ (ms/segment)").pack(side=tk.LEFT)
-        self.sp_speed = tk.Spinbox(r2, from_=1, to=2000, width=6)
+        ctk.CTkLabel(r2, text="Tốc độ (ms/segment, 0 = max)").pack(side=tk.LEFT)
+        self.sp_speed = tk.Spinbox(r2, from_=0, to=2000, width=6)
         self.sp_speed.delete(0, tk.END); self.sp_speed.insert(0, "250")
         self.sp_speed.pack(side=tk.LEFT, padx=(6,0))
 
@@ -247,11 +177,17 @@ class App(ctk.CTk):
         self.btn_pause = ctk.CTkButton(af, text="Pause", command=self.toggle_pause, state=tk.DISABLED)
         self.btn_pause.grid(row = 1, column = 2,sticky = 'w',padx = side[0],pady = side[1])
         ctk.CTkButton(af, text="Reset", command=self.reset_all).grid(row = 2, column = 0,sticky = 'w',padx = side[0],pady = side[1])
+        self.btn_cancel = ctk.CTkButton(af, text="Cancel", command=self.cancel_schedule, state=tk.DISABLED)
+        self.btn_cancel.grid(row = 3, column = 0,sticky = 'w',padx = side[0],pady = side[1])
 
         ctk.CTkButton(af, text="ADD", command=self.addNnum).grid(row = 2, column = 1,sticky = 'w',padx = side[0],pady = side[1])
         self.ent_add = ctk.CTkEntry(af)
         self.ent_add.grid(row = 2, column = 2,sticky = 'w',padx = side[0],pady = side[1])
 
+        ctk.CTkButton(af, text="Go to t", command=self.seek_entry).grid(row = 3, column = 1,sticky = 'w',padx = side[0],pady = side[1])
+        self.ent_seek = ctk.CTkEntry(af)
+        self.ent_seek.grid(row = 3, column = 2,sticky = 'w',padx = side[0],pady = side[1])
+
 
 
     def build_center_canvas(self):
@@ -266,8 +202,13 @@ class App(ctk.CTk):
         cv_frame.pack(fill = ctk.BOTH,expand = True)
 
         self.canvas = ctk.CTkCanvas(cv_frame, bg="#3C3D37", height=200, highlightthickness=0)
-        self.hbar = ctk.CTkScrollbar(cv_frame, orientation=ctk.HORIZONTAL, command=self.canvas.xview)
+        self.hbar = ctk.CTkScrollbar(cv_frame, orientation=ctk.HORIZONTAL, command=self.on_xview)
         self.canvas.configure(xscrollcommand=self.hbar.set)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_render())
+        # Ctrl + wheel zooms the time axis
+        self.canvas.bind("<Control-MouseWheel>", self.on_zoom)
+        self.canvas.bind("<Control-Button-4>", self.on_zoom)
+        self.canvas.bind("<Control-Button-5>", self.on_zoom)
 
         self.canvas.pack(fill=tk.BOTH, expand=True)
         self.hbar.pack(fill=tk.X)
@@ -280,6 +221,9 @@ class App(ctk.CTk):
         self.lbl_now.pack(side=tk.LEFT, padx=4)
         self.lbl_queue = ctk.CTkLabel(info, text="Ready: []")
         self.lbl_queue.pack(side=tk.LEFT, padx=14)
+        self.progress = ctk.CTkProgressBar(info, width=140)
+        self.progress.set(0)
+        self.progress.pack(side=tk.RIGHT, padx=8)
 
     def build_right_panel(self):
         right = ctk.CTkFrame(self)
@@ -318,16 +262,27 @@ class App(ctk.CTk):
         tblf = ttk.Labelframe(right, text="RESULT ALL OF PROCESSES")
         tblf.pack(fill=tk.BOTH, expand=True, pady=(10,0))
 
-        self.tbl = ttk.Treeview(tblf, columns=("ct","wt","tat","rt"), show="headings")
-        self.tbl.heading("ct", text="CT")
-        self.tbl.heading("wt", text="WT")
-        self.tbl.heading("tat", text="TAT")
-        self.tbl.heading("rt", text="RT")
-        self.tbl.column("ct", width=60, anchor="center")
-        self.tbl.column("wt", width=60, anchor="center")
-        self.tbl.column("tat", width=60, anchor="center")
-        self.tbl.column("rt", width=60, anchor="center")
-        self.tbl.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
+        find = ctk.CTkFrame(tblf)
+        find.pack(fill=tk.X, padx=6, pady=(6,0))
+        self.ent_find = ctk.CTkEntry(find, placeholder_text="PID", width=90)
+        self.ent_find.pack(side=tk.LEFT)
+        self.ent_find.bind("<Return>", lambda e: self.jump_to_pid())
+        ctk.CTkButton(find, text="Go", width=40, command=self.jump_to_pid).pack(side=tk.LEFT, padx=4)
+
+        # virtual table: only the rows that fit are inserted, scrolling rewrites their values
+        body = ttk.Frame(tblf)
+        body.pack(fill=tk.BOTH, expand=True, padx=6, pady=6)
+        self.tbl = ttk.Treeview(body, columns=COLUMNS, show="headings", selectmode="none")
+        self.tbl_bar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self.on_tbl_scroll)
+        for col in COLUMNS:
+            self.tbl.heading(col, text=col.upper(), command=partial(self.sort_table, col))
+            self.tbl.column(col, width=70 if col == "pid" else 60, anchor="center")
+        self.tbl.bind("<Configure>", self.on_tbl_resize)
+        self.tbl.bind("<MouseWheel>", lambda e: self.scroll_table(-1 if e.delta > 0 else 1) or "break")
+        self.tbl.bind("<Button-4>", lambda e: self.scroll_table(-1) or "break")
+        self.tbl.bind("<Button-5>", lambda e: self.scroll_table(1) or "break")
+        self.tbl.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tbl_bar.pack(side=tk.RIGHT, fill=tk.Y)
 
     def addNnum(self):
         try:
@@ -338,9 +293,11 @@ class App(ctk.CTk):
         pids, arrs, burs = seg_initializing(n)
         for i in range(n):
             self.processes.append(Proc(pids[i], arrs[i], burs[i]))
-            self.lst.insert(tk.END, f"{pids[i]} - A={arrs[i]}  B={burs[i]}")
             if pids[i] not in self.colors:
                 self.colors[pids[i]] = self.palette[(len(self.colors)) % len(self.palette)]
+        # one session update and one listbox call for the whole batch
+        self.edit_session(lambda s: s.extend(Proc(pids[i], arrs[i], burs[i]) for i in range(n)))
+        self.lst.insert(tk.END, *(f"{pids[i]} - A={arrs[i]}  B={burs[i]}" for i in range(n)))
 
     def add_proc(self):
         pid = self.ent_pid.get().strip() or f"P{len(self.processes)+1}"
@@ -357,6 +314,7 @@ class App(ctk.CTk):
             messagebox.showerror("Lỗi", "PID đã tồn tại.")
             return
         self.processes.append(Proc(pid, arr, bur))
+        self.edit_session(lambda s: s.add(Proc(pid, arr, bur)))
         self.lst.insert(tk.END, f"{pid} - A={arr}  B={bur}")
 
         # color map
@@ -370,13 +328,30 @@ class App(ctk.CTk):
         pid = self.processes[idx].pid
         self.lst.delete(idx)
         del self.processes[idx]
+        self.edit_session(lambda s: s.remove(pid))
     
     def clear_list(self):
         self.lst.delete(0, tk.END)
         self.processes.clear()
+        self.session = None
+
+    def edit_session(self, edit):
+        # apply an add/remove to the kept IncrementalRR so the next Run only
+        # re-simulates from the last checkpoint before the edited arrival
+        if self.session is None:
+            return
+        if self.computing:
+            # the worker is using it
+            self.session = None
+            return
+        try:
+            edit(self.session)
+        except (ValueError, KeyError):
+            # duplicate PIDs (e.g. ADD twice): fall back to full runs
+            self.session = None
 
     def run_schedule(self):
-        if self.animating:
+        if self.animating or self.computing:
             return
         if not self.processes:
             messagebox.showinfo("Thông báo","Hãy thêm ít nhất 1 tiến trình.")
@@ -387,16 +362,114 @@ class App(ctk.CTk):
         except ValueError:
             messagebox.showerror("Lỗi", "Quantum/CS phải là số.")
             return
-        # deep copy processes for compute (keep original list intact)
-        cloned = [Proc(p.pid, p.arrival, p.burst) for p in self.processes]
-        self.segments, self.stats, self.totals = CalculateRR(cloned, q, cs)
-        self.update_totals()
-        self.populate_table()
-        self.prepare_canvas()
+        if q < 1 or cs < 0:
+            messagebox.showerror("Lỗi", "Quantum >= 1 và CS >= 0.")
+            return
+        if self.session is None or self.session_key != (q, cs):
+            # deep copy processes for compute (keep original list intact)
+            cloned = [Proc(p.pid, p.arrival, p.burst) for p in self.processes]
+            try:
+                self.session, self.session_key = IncrementalRR(cloned, q, cs, merge=True), (q, cs)
+                job = self.session.run
+            except ValueError:
+                self.session = None
+                job = partial(CalculateRR, cloned, q, cs, merge=True)
+        else:
+            job = self.session.run
+        self.segments, self.stats, self.totals = SegmentLog(), {}, {}
+        # scale from an upper bound of the makespan (last arrival, then all the work and a
+        # cs after every slice); the real one is known at the end
+        slices = sum(-(-p.burst // q) for p in self.processes)
+        self.prepare_canvas(max(p.arrival for p in self.processes) + sum(p.burst for p in self.processes)
+                            + cs * slices)
         self.anim_idx = 0
+
+        key = result_key(procs_hash(self.processes), "CalculateRR:merged", q, cs)
+        hit = self.cache.get(key)
+        if hit is not None:
+            segments, self.stats, self.totals = hit
+            self.add_segments(segments)
+            self.progress.set(1)
+            self.update_totals()
+            self.populate_table()
+            self.animating = True
+            self.btn_pause.configure(state=tk.NORMAL, text="Pause")
+            self.start_animation()
+            return
+
+        # CalculateRR / IncrementalRR.run runs in a worker thread and sends segments in batches;
+        # poll_schedule() picks them up on the Tk side while the animation runs
+        self.computing = True
+        self.cancel_event = threading.Event()
+        self.results = queue.Queue()
+        threading.Thread(target=self.compute_schedule, daemon=True,
+                         args=(job, self.cancel_event, self.results, self.cache, key)).start()
+        self.progress.set(0)
+        self.btn_cancel.configure(state=tk.NORMAL)
+        self.after(self.POLL_MS, self.poll_schedule)
+
         self.animating = True
         self.btn_pause.configure(state=tk.NORMAL, text="Pause")
-        self.animate_step()
+        self.start_animation()
+
+    POLL_MS = 30
+
+    @staticmethod
+    def compute_schedule(job, cancel, results, cache, key):
+        # worker thread: no Tk calls in here, everything goes through `results`
+        try:
+            segments, stats, totals = job(cancel=cancel, on_batch=lambda segs, done: results.put(("batch", segs, done)))
+            # copy: IncrementalRR keeps editing its own log
+            segments = segments.copy()
+        except Cancelled:
+            results.put(("cancelled",))
+        except Exception as e:
+            results.put(("error", str(e)))
+        else:
+            results.put(("done", stats, totals))
+            cache.put(key, (segments, stats, totals))
+
+    def poll_schedule(self):
+        if not self.computing:
+            return
+        try:
+            while True:
+                msg = self.results.get_nowait()
+                if msg[0] == "batch":
+                    self.add_segments(msg[1])
+                    self.progress.set(msg[2])
+                    continue
+                self.finish_schedule()
+                if msg[0] == "done":
+                    self.stats, self.totals = msg[1], msg[2]
+                    self.update_totals()
+                    self.populate_table()
+                elif msg[0] == "best":
+                    self.show_best(msg[1])
+                elif msg[0] == "error":
+                    messagebox.showerror("Lỗi", msg[1])
+                else:
+                    self.animating = False
+                    self.btn_pause.configure(state=tk.DISABLED, text="Pause")
+                    self.lbl_queue.configure(text="Cancelled")
+                return
+        except queue.Empty:
+            pass
+        self.after(self.POLL_MS, self.poll_schedule)
+
+    def add_segments(self, batch):
+        self.segments.extend(batch)
+        if len(batch) and batch.end[-1] > self.makespan:
+            self.makespan = batch.end[-1]
+            self.update_scrollregion()
+
+    def finish_schedule(self):
+        self.computing = False
+        self.btn_cancel.configure(state=tk.DISABLED)
+
+    def cancel_schedule(self):
+        if self.computing:
+            self.cancel_event.set()
 
     def step_once(self):
         if not self.segments:
@@ -404,110 +477,343 @@ class App(ctk.CTk):
             return
         if self.anim_idx >= len(self.segments):
             return
-        self.draw_segment(self.segments[self.anim_idx])
+        self.draw_segment(self.anim_idx)
         self.anim_idx += 1
-        self.lbl_now.configure(text=f"t = {self.segments[self.anim_idx-1].end}")
+        self.update_labels()
 
     def toggle_pause(self):
         if not self.animating:
             # resume auto animation
             self.animating = True
             self.btn_pause.configure(text="Pause")
-            self.animate_step()
+            self.start_animation()
         else:
             self.animating = False
             self.btn_pause.configure(text="Resume")
 
 
     def reset_all(self):
+        if self.computing:
+            self.cancel_event.set()
+            self.finish_schedule()
+        self.progress.set(0)
         self.anim_idx = 0
         self.animating = False
         self.btn_pause.configure(state=tk.DISABLED, text="Pause")
         self.canvas.delete("all")
         self.lbl_now.configure(text="t = 0")
         self.lbl_queue.configure(text="Ready: []")
-        self.tbl.delete(*self.tbl.get_children())
+        self.table = ResultTable([], [], [], [], [])
+        self.tbl_top, self.tbl_mark = 0, None
+        self.render_table()
         self.var_wt.set("0.00")
         self.var_tat.set("0.00")
         self.var_util.set("0.00%")
         self.var_tp.set("0.00/s")
-        self.segments = []
+        self.segments = SegmentLog()
         self.stats = {}
         self.totals = {}
+        self.makespan = 0
+        self.seg_starts = self.segments.start
+        self.seg_ends = self.segments.end
     
+    # Animation runs in frames of FRAME_MS: every frame reveals the segments that are
+    # due at the chosen speed (at speed 0: up to one viewport further, within the
+    # frame budget), draws them, and updates the labels once.
+    FRAME_MS = 16
+
+    def anim_delay(self):
+        try:
+            return max(0.0, float(self.sp_speed.get()))
+        except ValueError:
+            return 250.0
+
+    def start_animation(self):
+        self.anim_t0 = time.perf_counter()
+        self.anim_base = self.anim_idx
+        self.animate_step()
+
     def animate_step(self):
         if not self.animating:
             return
         if self.anim_idx >= len(self.segments):
+            if self.computing:
+                # caught up with the worker: wait for the next batch
+                self.after(self.FRAME_MS, self.animate_step)
+                return
             self.animating = False
             self.btn_pause.configure(state=tk.DISABLED, text="Pause")
             return
-        seg = self.segments[self.anim_idx]
-        self.draw_segment(seg)
-        self.anim_idx += 1
-        self.lbl_now.configure(text=f"t = {seg.end}")
+        now = time.perf_counter()
+        delay = self.anim_delay()
+        horizon = None
+        if delay > 0:
+            due = self.anim_base + int((now - self.anim_t0) * 1000 / delay) + 1
+        else:
+            due = len(self.segments)
+            t0, t1 = self.visible_range()
+            horizon = t1 + (t1 - t0)
+        self.reveal_until(min(due, len(self.segments)), now + self.FRAME_MS / 1000, horizon)
+        self.update_labels()
+
+        wait = self.FRAME_MS
+        if delay > self.FRAME_MS:
+            # sleep until the next segment is due
+            next_due = self.anim_t0 + (self.anim_idx - self.anim_base) * delay / 1000
+            wait = max(self.FRAME_MS, int((next_due - time.perf_counter()) * 1000))
+        self.after(wait, self.animate_step)
+
+    def reveal_until(self, target, deadline, horizon=None):
+        # show segments up to `target` (or until the frame deadline): the ones inside
+        # the viewport are drawn right away; once the animation runs past the right
+        # edge, the view follows it and the viewport is drawn once at the end
+        t0, t1 = self.visible_range()
+        redraw = self.lod
+        first = self.anim_idx
+        starts, ends = self.seg_starts, self.seg_ends
+        while self.anim_idx < target:
+            k = self.anim_idx
+            if horizon is not None and starts[k] >= horizon and k > first:
+                break
+            self.anim_idx += 1
+            if ends[k] > t1:
+                redraw = True
+            elif not redraw and ends[k] > t0:
+                self.draw_one(k)
+            if self.anim_idx & 63 == 0 and time.perf_counter() > deadline:
+                break
+        if redraw:
+            self.follow(ends[self.anim_idx - 1])
+            self.render_view()
+
+    def best_quantum(self):
+        # quantum with the lowest average waiting time for the current list and cs,
+        # searched on the worker thread like a Run; poll_schedule() shows the result
+        if self.animating or self.computing:
+            return
+        if not self.processes:
+            messagebox.showinfo("Thông báo","Hãy thêm ít nhất 1 tiến trình.")
+            return
         try:
-            delay = int(self.sp_speed.get())
-        except:
-            delay = 250
-        self.after(max(1, delay), self.animate_step)
-    
-    def prepare_canvas(self):
+            cs = int(self.sp_cs.get())
+        except ValueError:
+            messagebox.showerror("Lỗi", "Quantum/CS phải là số.")
+            return
+        if cs < 0:
+            messagebox.showerror("Lỗi", "Quantum >= 1 và CS >= 0.")
+            return
+        data = dict(arrival_time=[p.arrival for p in self.processes], burst_time=[p.burst for p in self.processes])
+        self.computing = True
+        self.cancel_event = threading.Event()
+        self.results = queue.Queue()
+        threading.Thread(target=self.compute_best, daemon=True, args=(data, cs, self.cancel_event, self.results)).start()
+        self.btn_cancel.configure(state=tk.NORMAL)
+        self.lbl_queue.configure(text="Searching best q ...")
+        self.after(self.POLL_MS, self.poll_schedule)
+
+    @staticmethod
+    def compute_best(data, cs, cancel, results):
+        # worker thread: the search cannot be interrupted, a cancel only drops its result
+        try:
+            result = find_best_quantum(data, "avg_waiting", cs)
+        except Exception as e:
+            results.put(("error", str(e)))
+            return
+        results.put(("cancelled",) if cancel.is_set() else ("best", result))
+
+    def show_best(self, result):
+        self.sp_q.delete(0, tk.END); self.sp_q.insert(0, str(result["quantum"]))
+        self.lbl_queue.configure(text=f"Best q = {result['quantum']} (avg WT {result['value']:.2f}, "
+                                      f"{result['evaluations']} runs)")
+
+    def seek_entry(self):
+        try:
+            t = float(self.ent_seek.get().strip())
+        except ValueError:
+            messagebox.showerror("Lỗi", "Thời gian phải là số.")
+            return
+        self.seek(t)
+
+    def seek(self, t):
+        # jump to time t: everything that started before t is shown, in one render
+        if not self.segments:
+            return
+        self.anim_idx = max(1, bisect_left(self.seg_starts, t))
+        self.anim_t0 = time.perf_counter()
+        self.anim_base = self.anim_idx
+        self.follow(min(t, self.seg_ends[self.anim_idx - 1]))
+        self.render_view()
+        self.update_labels()
+
+    def update_labels(self):
+        if not self.anim_idx:
+            return
+        self.lbl_now.configure(text=f"t = {self.seg_ends[self.anim_idx - 1]}")
+        # Update “Ready” label (approx): show queue after this segment
+        # Quick preview: collect the next contiguous run PIDs
+        q_preview = []
+        for j in range(self.anim_idx, min(self.anim_idx+6, len(self.segments))):
+            pid = self.segments.pid_at(j)
+            if self.segments.kind[j] == RUN and pid:
+                q_preview.append(pid)
+        self.lbl_queue.configure(text=f"Ready: {q_preview}")
+
+    def prepare_canvas(self, makespan=None):
         self.canvas.delete("all")
+        self.makespan = self.segments.end[-1] if len(self.segments) else 0
+        self.seg_starts = self.segments.start
+        self.seg_ends = self.segments.end
+        if makespan is None:
+            makespan = self.makespan
         # Auto scale to fit to ~1200px wide if can
-        makespan = self.segments[-1].end if self.segments else 0
         if makespan <= 0:
             self.scale_px = 50
         else:
             target = 1400
             self.scale_px = max(8, min(100, int(target / max(1, makespan))))
+        self.update_scrollregion()
+        self.canvas.xview_moveto(0)
         # Axis
         self.canvas.create_text(10, 12, anchor="w", fill="#9AA0A6",
                                 text="Thời gian (đơn vị)")
-        # baseline
-        self.canvas.create_line(0, 40, 9999, 40, fill="#2A2F36")
 
-    def draw_segment(self, seg: Segment):
+    # Gantt chart: only the part inside the viewport is on the canvas ("gantt" tag).
+    # It is redrawn on scroll/zoom/resize; segments narrower than MIN_SEG_PX on
+    # average are drawn as BAND_PX-wide summary bands instead of one by one.
+    PAD = 10
+    MIN_SEG_PX = 4
+    BAND_PX = 3
+
+    def x_of(self, t):
+        return t * self.scale_px + self.PAD
+
+    def update_scrollregion(self):
+        # known from the makespan, no need to measure the items
+        self.canvas.configure(scrollregion=(0, 0, self.x_of(self.makespan) + self.PAD, 200))
+
+    def visible_range(self):
+        x0 = self.canvas.canvasx(0)
+        x1 = self.canvas.canvasx(max(1, self.canvas.winfo_width()))
+        return (x0 - self.PAD) / self.scale_px, (x1 - self.PAD) / self.scale_px
+
+    def on_xview(self, *args):
+        self.canvas.xview(*args)
+        self.schedule_render()
+
+    def on_zoom(self, event):
+        if not self.segments:
+            return
+        zoom_in = getattr(event, "delta", 0) > 0 or getattr(event, "num", 0) == 4
+        t = (self.canvas.canvasx(event.x) - self.PAD) / self.scale_px
+        fit = (max(1, self.canvas.winfo_width()) - 2 * self.PAD) / max(1, self.makespan)
+        self.scale_px = max(min(fit, 8), min(200, self.scale_px * (1.25 if zoom_in else 0.8)))
+        self.update_scrollregion()
+        self.canvas.xview_moveto(max(0.0, (self.x_of(t) - event.x) / (self.x_of(self.makespan) + self.PAD)))
+        self.schedule_render()
+
+    def schedule_render(self):
+        if not self.render_pending:
+            self.render_pending = True
+            self.after_idle(self.render_view)
+
+    def render_view(self):
+        self.render_pending = False
+        self.lod = False
+        self.canvas.delete("gantt")
+        shown = self.anim_idx
+        if not shown:
+            return
+        t0, t1 = self.visible_range()
+        lo = bisect_right(self.seg_ends, t0)
+        hi = min(shown, bisect_left(self.seg_starts, t1))
+        if lo < hi:
+            self.lod = (t1 - t0) * self.scale_px / (hi - lo) < self.MIN_SEG_PX
+            if self.lod:
+                self.draw_bands(lo, hi, t0, t1)
+            else:
+                for k in range(lo, hi):
+                    self.draw_one(k)
+        self.draw_ticks(t0, min(t1, self.seg_ends[shown - 1]))
+
+    def draw_bands(self, lo, hi, t0, t1):
+        # level of detail: one sample per band (the segment at its centre),
+        # neighbouring bands of the same colour merged into one rectangle
+        y0 = 60
+        y1 = y0 + self.row_height
+        x_start = max(self.x_of(self.seg_starts[lo]), self.x_of(t0))
+        x_end = min(self.x_of(self.seg_ends[hi - 1]), self.x_of(t1))
+        run_color, run_x = None, x_start
+        x = x_start
+        while x < x_end:
+            t = (x + self.BAND_PX / 2 - self.PAD) / self.scale_px
+            k = bisect_right(self.seg_starts, t) - 1
+            color = self.segment_color(k) if lo <= k < hi and self.seg_ends[k] > t else None
+            if color != run_color:
+                if run_color:
+                    self.canvas.create_rectangle(run_x, y0, x, y1, fill=run_color, width=0, tags="gantt")
+                run_color, run_x = color, x
+            x += self.BAND_PX
+        if run_color:
+            self.canvas.create_rectangle(run_x, y0, x_end, y1, fill=run_color, width=0, tags="gantt")
+
+    def draw_ticks(self, t0, t1):
+        y1 = 60 + self.row_height
+        # label every `step` units, at least ~50px apart
+        step = 1
+        while step * self.scale_px < 50:
+            step = step * 5 // 2 if str(step)[0] == "2" else step * 2
+        minor = step // 5 if step >= 5 and step // 5 * self.scale_px >= 6 else step
+        t = max(0, int(t0) // minor * minor)
+        while t <= t1:
+            X = self.x_of(t)
+            self.canvas.create_line(X, y1+1, X, y1+6, fill="#2A2F36", tags="gantt")
+            if t % step == 0:
+                self.canvas.create_text(X, y1+16, text=str(t), fill="#9AA0A6", tags="gantt")
+            t += minor
+
+    # segments are read by index straight from the SegmentLog arrays
+    def segment_color(self, k):
+        kind = self.segments.kind[k]
+        if kind == RUN:
+            pid = self.segments.pid_at(k)
+            if pid:
+                return self.colors.get(pid, "#4895EF")
+        if kind == CS:
+            return self.cs_color
+        return self.idle_color
+
+    def draw_one(self, k):
         # y bands: we draw everything on a single band for simplicity
         y0 = 60
         y1 = y0 + self.row_height
 
-        x0 = seg.start * self.scale_px + 10
-        x1 = seg.end   * self.scale_px + 10
-
-        if seg.kind == 'run' and seg.pid:
-            color = self.colors.get(seg.pid, "#4895EF")
-            rect = self.canvas.create_rectangle(x0, y0, x1, y1, fill=color, width=0)
-            self.canvas.create_text((x0+x1)//2, (y0+y1)//2, text=seg.pid, fill="white")
-        elif seg.kind == 'cs':
-            # context switch as striped/gray bar
-            rect = self.canvas.create_rectangle(x0, y0, x1, y1, fill=self.cs_color, width=0)
-            self.canvas.create_text((x0+x1)//2, (y0+y1)//2, text="CS", fill="#EDEDED")
-        else:
-            # idle gap
-            self.canvas.create_rectangle(x0, y0, x1, y1, fill=self.idle_color, width=0)
-            self.canvas.create_text((x0+x1)//2, (y0+y1)//2, text="IDLE", fill="#C9D1D9")
-
-        # ticks
-        for t in range(seg.start, seg.end+1):
-            X = t*self.scale_px + 10
-            self.canvas.create_line(X, y1+1, X, y1+6, fill="#2A2F36")
-            if t % 5 == 0:
-                self.canvas.create_text(X, y1+16, text=str(t), fill="#9AA0A6")
-
-        # Scroll region
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        # Auto-scroll to show the latest part
-        self.canvas.xview_moveto(max(0.0, (x1-600)/max(1, (self.canvas.bbox("all")[2]-600))))
-
-        # Update “Ready” label (approx): show queue after this segment
-        # Quick preview: collect the next contiguous run PIDs
-        q_preview = []
-        for j in range(self.anim_idx+1, min(self.anim_idx+1+6, len(self.segments))):
-            s = self.segments[j]
-            if s.kind == 'run' and s.pid:
-                q_preview.append(s.pid)
-        self.lbl_queue.configure(text=f"Ready: {q_preview}")
+        x0 = self.x_of(self.seg_starts[k])
+        x1 = self.x_of(self.seg_ends[k])
+
+        self.canvas.create_rectangle(x0, y0, x1, y1, fill=self.segment_color(k), width=0, tags="gantt")
+        if x1 - x0 >= 24:
+            kind, pid = self.segments.kind[k], self.segments.pid_at(k)
+            if kind == RUN and pid:
+                text, fill = pid, "white"
+            elif kind == CS:
+                # context switch as gray bar
+                text, fill = "CS", "#EDEDED"
+            else:
+                # idle gap
+                text, fill = "IDLE", "#C9D1D9"
+            self.canvas.create_text((x0+x1)//2, (y0+y1)//2, text=text, fill=fill, tags="gantt")
+
+    def follow(self, t):
+        # scroll so that time t is in view (at the right edge if it was past it)
+        x = self.x_of(t)
+        width = max(1, self.canvas.winfo_width())
+        if x > self.canvas.canvasx(width) or x < self.canvas.canvasx(0):
+            self.canvas.xview_moveto(max(0.0, (x - width + self.PAD) / (self.x_of(self.makespan) + self.PAD)))
+
+    def draw_segment(self, k):
+        # reveal segment k (Step): keep it in view, then redraw the viewport
+        self.follow(self.seg_ends[k])
+        self.schedule_render()
 
     def update_totals(self):
         if not self.totals: return
@@ -517,12 +823,74 @@ class App(ctk.CTk):
         self.var_tp.set(f"{self.totals['throughput']:.2f}/u")
 
     def populate_table(self):
-        self.tbl.delete(*self.tbl.get_children())
-        for pid in sorted(self.stats.keys()):
-            s = self.stats[pid]
-            self.tbl.insert("", tk.END, values=(s["CT"], s["WT"], s["TAT"], s["RT"]))
+        self.table = ResultTable.from_stats(self.stats)
+        self.tbl_top, self.tbl_mark = 0, None
+        self.render_table()
+
+    TABLE_ROW_PX = 26       # the Treeview rowheight set in __init__
+
+    def on_tbl_resize(self, event):
+        rows = max(1, event.height // self.TABLE_ROW_PX - 1)    # minus the heading
+        if rows != self.tbl_rows:
+            self.tbl_rows = rows
+            self.render_table()
+
+    def render_table(self):
+        # fill the visible Treeview rows from the sorted view at tbl_top
+        n, rows = len(self.table), self.tbl_rows
+        self.tbl_top = max(0, min(self.tbl_top, n - rows))
+        values = self.table.rows(self.tbl_top, self.tbl_top + rows, *self.tbl_sort)
+        items = self.tbl.get_children()
+        if len(items) > len(values):
+            self.tbl.delete(*items[len(values):])
+            items = items[:len(values)]
+        for item, row in zip(items, values):
+            self.tbl.item(item, values=row)
+        for row in values[len(items):]:
+            self.tbl.insert("", tk.END, values=row)
+
+        mark = None
+        if self.tbl_mark is not None:
+            pos = self.table.position_of(self.tbl_mark, *self.tbl_sort)
+            if self.tbl_top <= pos < self.tbl_top + len(values):
+                mark = self.tbl.get_children()[pos - self.tbl_top]
+        self.tbl.selection_set(mark if mark else ())
+        self.tbl_bar.set(self.tbl_top / n if n else 0.0, (self.tbl_top + rows) / n if n else 1.0)
+
+    def scroll_table(self, rows):
+        self.tbl_top += rows
+        self.render_table()
+
+    def on_tbl_scroll(self, *args):
+        # scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"|"pages")
+        if args[0] == "moveto":
+            self.tbl_top = int(float(args[1]) * len(self.table))
+            self.render_table()
+        elif args[0] == "scroll":
+            self.scroll_table(int(args[1]) * (self.tbl_rows if args[2] == "pages" else 1))
+
+    def sort_table(self, column):
+        # a second click on the same heading flips the direction
+        col, reverse = self.tbl_sort
+        self.tbl_sort = (column, not reverse if column == col else False)
+        for c in COLUMNS:
+            arrow = (" ▼" if self.tbl_sort[1] else " ▲") if c == column else ""
+            self.tbl.heading(c, text=c.upper() + arrow)
+        self.tbl_top = 0
+        self.render_table()
+
+    def jump_to_pid(self):
+        pid = self.ent_find.get().strip()
+        pos = self.table.position_of(pid, *self.tbl_sort)
+        if pos is None:
+            messagebox.showerror("Lỗi", f"PID {pid} không có trong kết quả.")
+            return
+        self.tbl_mark = pid
+        self.tbl_top = pos - self.tbl_rows // 2
+        self.render_table()
 
 
 
-app = App()
-app.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    app = App()
+    app.mainloop()
@@ -0,0 +1,94 @@
+from collections import Counter
+from time import perf_counter
+
+# events an engine reports, in the order bind() returns them:
+#   arrival(t, pid)                     a process joins the ready queue
+#   slice_start(t, pid, ready_len)      pid gets the CPU; ready_len processes are still waiting
+#   slice_end(t, pid, remain)           the slice is over, pid still needs `remain`
+#   completion(t, pid)                  pid is finished
+#   idle(start, end)                    nothing ready between start and end
+#   context_switch(start, end)          switching to another process (start == end without a cs cost)
+#   phase(name)                         the engine enters "setup", "admit", "run", "summary" or "done"
+EVENTS = ("arrival", "slice_start", "slice_end", "completion", "idle", "context_switch", "phase")
+
+
+class Observer:
+    # subclass and override only the events you need: events nobody overrides are
+    # never called, so the engine only pays a local None check for them
+    def arrival(self, t, pid): pass
+    def slice_start(self, t, pid, ready_len): pass
+    def slice_end(self, t, pid, remain): pass
+    def completion(self, t, pid): pass
+    def idle(self, start, end): pass
+    def context_switch(self, start, end): pass
+    def phase(self, name): pass
+
+def _fan_out(fns):
+    def call(*args):
+        for fn in fns:
+            fn(*args)
+    return call
+
+def bind(observers):
+    # one callable per event for the engine loop, None where no observer listens
+    observers = list(observers or ())
+    bound = []
+    for name in EVENTS:
+        fns = [getattr(o, name) for o in observers if getattr(type(o), name) is not getattr(Observer, name)]
+        bound.append(None if not fns else fns[0] if len(fns) == 1 else _fan_out(fns))
+    return bound
+
+
+class QueueLengthHistogram(Observer):
+    # ready-queue length seen at every dispatch, counted per dispatch and weighted by
+    # how long the slice that followed ran (time spent at that length)
+    def __init__(self):
+        self.dispatches = Counter()
+        self.time = Counter()
+        self._len = 0
+        self._start = 0
+
+    def slice_start(self, t, pid, ready_len):
+        self.dispatches[ready_len] += 1
+        self._len = ready_len
+        self._start = t
+
+    def slice_end(self, t, pid, remain):
+        self.time[self._len] += t - self._start
+
+    def mean(self):
+        total = sum(self.time.values())
+        return sum(k * v for k, v in self.time.items()) / total if total else 0.0
+
+class SwitchCounter(Observer):
+    # context switches and idle periods, with the time spent in each
+    def __init__(self):
+        self.switches = 0
+        self.switch_time = 0
+        self.idle_periods = 0
+        self.idle_time = 0
+
+    def context_switch(self, start, end):
+        self.switches += 1
+        self.switch_time += end - start
+
+    def idle(self, start, end):
+        self.idle_periods += 1
+        self.idle_time += end - start
+
+class PhaseProfiler(Observer):
+    # wall-clock seconds the engine spends in each phase. Per-slice phases cost two
+    # perf_counter() calls per slice, and other attached observers are timed with them
+    def __init__(self):
+        self.seconds = Counter()
+        self.calls = Counter()
+        self._current = None
+        self._since = 0.0
+
+    def phase(self, name):
+        now = perf_counter()
+        if self._current is not None:
+            self.seconds[self._current] += now - self._since
+        self.calls[name] += 1
+        self._current = None if name == "done" else name
+        self._since = now
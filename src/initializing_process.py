@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from workload import COLUMNS, HEADER, MAGIC, SUFFIX, VERSION, write_workload
 
 def initializing():
     n = 100
@@ -9,7 +10,6 @@ def initializing():
     burst_time = np.ceil(burst).astype(int)
 
     arrival_time = np.random.randint(low = 1,high =10,size = n)
-    arrival_time = np.ceil(burst).astype(int)
     arrival_time = np.sort(arrival_time)
     
     process_id = np.arange(1,n+1)
@@ -26,13 +26,13 @@ def initializing():
     csv_path = here / 'db' / 'data_set.csv'
     df.to_csv(csv_path,index= False)
 
-def par_initializing(n):
+def par_initializing(n, binary=False):
+    # binary=True writes db/data_set.rrw (see workload.py) instead of the CSV
     burst = np.random.randint(low = 1,high =10,size = n) # data type = int32
 
     burst_time = np.ceil(burst).astype(int)
 
     arrival_time = np.random.randint(low = 1,high =10,size = n)
-    arrival_time = np.ceil(burst).astype(int)
     arrival_time = np.sort(arrival_time)
     
     process_id = np.arange(1,n+1)
@@ -41,9 +41,13 @@ def par_initializing(n):
 
     data = np.array([process_id,arrival_time,burst_time,priority])
     
+    here = Path(__file__).resolve().parent
+    if binary:
+        write_workload(here / 'db' / 'data_set.rrw', dict(zip(COLUMNS, data)))
+        return
+
     df = pd.DataFrame(data).T.set_axis(["process_id","arrival_time","burst_time","priority"],axis="columns")
     # "T" -> transpose
-    here = Path(__file__).resolve().parent
     csv_path = here / 'db' / 'data_set.csv'
     df.to_csv(csv_path,index= False)
 
@@ -52,13 +56,167 @@ def seg_initializing(n):
     burst_time = np.ceil(burst).astype(int)
 
     arrival_time = np.random.randint(low = 1,high =10,size = n)
-    arrival_time = np.ceil(burst).astype(int)
     arrival_time = np.sort(arrival_time)
     
     process_id = np.array([f"P{i}" for i in range(1, n + 1)])
 
     return process_id,arrival_time,burst_time
 
+def random_workload(n, seed=None):
+    # same distribution as par_initializing(), but from its own seeded generator
+    # and kept in memory (columns as numpy arrays, usable wherever a DataFrame is)
+    rng = np.random.default_rng(seed)
+    burst_time = rng.integers(low = 1,high =10,size = n)
+    arrival_time = np.sort(rng.integers(low = 1,high =10,size = n))
+
+    process_id = np.arange(1,n+1)
+    priority = rng.permutation(process_id)
+
+    return {"process_id": process_id, "arrival_time": arrival_time,
+            "burst_time": burst_time, "priority": priority}
+
+# generate_workload(): arrivals as a Poisson process (exponential inter-arrival gaps)
+# or at a constant rate, bursts from one of BURSTS, written chunk by chunk.
+# Chunk k always comes from SeedSequence(seed).spawn(...)[k], so the output only
+# depends on (seed, n, chunksize, distribution parameters), not on the workers.
+BURSTS = ("uniform", "exponential", "lognormal", "pareto")
+
+
+def _bursts(rng, size, dist, mean, low, high, alpha):
+    if dist == "uniform":
+        return rng.integers(low, high + 1, size=size)
+    if dist == "exponential":
+        b = rng.exponential(mean, size=size)
+    elif dist == "lognormal":
+        sigma = 1.0
+        b = rng.lognormal(np.log(mean) - sigma**2 / 2, sigma, size=size)
+    elif dist == "pareto":
+        # classic Pareto with shape alpha, scaled so that its mean is `mean` (alpha > 1)
+        xm = mean * (alpha - 1) / alpha
+        b = xm * (1 + rng.pareto(alpha, size=size))
+    else:
+        raise ValueError(f"unknown burst distribution {dist!r}, expected one of {BURSTS}")
+    return np.maximum(1, np.ceil(b)).astype(np.int64)
+
+def _chunk(seed_seq, start, size, t0, span, params):
+    # rows [start, start + size) of the workload; arrivals spread over [t0, t0 + span)
+    rng = np.random.default_rng(seed_seq)
+    if params["arrival"] == "poisson":
+        # n exponential gaps conditioned on their sum: normalized exponential spacings
+        gaps = rng.exponential(1.0, size=size)
+        times = t0 + np.cumsum(gaps) * (span / gaps.sum())
+    else:
+        times = t0 + np.arange(1, size + 1) * (span / size)
+    arrival_time = np.floor(times).astype(np.int64)
+    burst_time = _bursts(rng, size, params["burst"], params["mean_burst"],
+                         params["low"], params["high"], params["alpha"])
+    priority = rng.integers(1, params["priority_levels"] + 1, size=size)
+    process_id = np.arange(start + 1, start + size + 1, dtype=np.int64)
+    return np.stack([process_id, arrival_time, burst_time, priority])
+
+def _chunk_to_file(path, n, dtype, seed_seq, start, size, t0, span, params):
+    rows = _chunk(seed_seq, start, size, t0, span, params)
+    table = np.memmap(path, dtype=dtype, mode="r+", offset=HEADER.size, shape=(len(COLUMNS), n))
+    table[:, start:start + size] = rows
+    table.flush()
+    del table
+
+def _plan(n, seed, arrival, rate, chunksize):
+    # (seed sequence, start, size, t0, span) of every chunk: the one seeding path of
+    # generate_workload() and make_workload()
+    if arrival not in ("poisson", "constant"):
+        raise ValueError(f"unknown arrival process {arrival!r}, expected 'poisson' or 'constant'")
+    starts = list(range(0, n, chunksize))
+    sizes = [min(chunksize, n - s) for s in starts]
+    root = np.random.SeedSequence(seed)
+    seqs = root.spawn(len(starts) + 1)
+    if arrival == "poisson":
+        spans = np.random.default_rng(seqs[-1]).gamma(sizes, 1.0 / rate) if sizes else np.zeros(0)
+    else:
+        spans = np.asarray(sizes, dtype=np.float64) / rate
+    offsets = np.concatenate(([0.0], np.cumsum(spans)[:-1]))
+    return list(zip(seqs, starts, sizes, offsets, spans))
+
+def make_workload(n, seed=0, arrival="poisson", rate=0.2, burst="pareto", mean_burst=5.0,
+                  low=1, high=9, alpha=1.5, priority_levels=1000, chunksize=1 << 20):
+    # in-memory counterpart of generate_workload(): the same rows for the same arguments
+    if n == 0:
+        return {col: np.zeros(0, dtype=np.int64) for col in COLUMNS}
+    params = dict(arrival=arrival, burst=burst, mean_burst=mean_burst, low=low, high=high,
+                  alpha=alpha, priority_levels=priority_levels)
+    chunks = [_chunk(*job, params) for job in _plan(n, seed, arrival, rate, chunksize)]
+    return dict(zip(COLUMNS, np.concatenate(chunks, axis=1)))
+
+def generate_workload(path, n, seed=0, arrival="poisson", rate=0.2, burst="pareto",
+                      mean_burst=5.0, low=1, high=9, alpha=1.5, priority_levels=1000,
+                      chunksize=1 << 20, workers=None, dtype=np.int64):
+    # seeded workload of n processes streamed to `path` (.rrw, or CSV otherwise).
+    # rate is the mean number of arrivals per time unit. Chunk boundaries of a Poisson
+    # process are drawn up front from Gamma(chunk size, 1/rate); workers then fill in
+    # their chunk independently, so memory stays at a few chunks.
+    from concurrent.futures import ProcessPoolExecutor
+    import os
+
+    if burst not in BURSTS:
+        raise ValueError(f"unknown burst distribution {burst!r}, expected one of {BURSTS}")
+    params = dict(arrival=arrival, burst=burst, mean_burst=mean_burst, low=low, high=high,
+                  alpha=alpha, priority_levels=priority_levels)
+    jobs = _plan(n, seed, arrival, rate, chunksize)
+
+    workers = workers or os.cpu_count() or 1
+    binary = Path(path).suffix == SUFFIX
+    if binary:
+        dtype = np.dtype(dtype).newbyteorder("<")
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, n, len(COLUMNS), dtype.itemsize))
+            f.truncate(HEADER.size + len(COLUMNS) * n * dtype.itemsize)
+        if n == 0:
+            return path
+        if workers == 1:
+            for job in jobs:
+                _chunk_to_file(path, n, dtype, *job, params)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_chunk_to_file, *zip(*[(path, n, dtype, *job, params) for job in jobs])))
+        return path
+
+    # CSV: chunks must be appended in order, keep at most 2 * workers of them in flight
+    with open(path, "w", newline="") as f:
+        f.write(",".join(COLUMNS) + "\n")
+        if workers == 1:
+            for job in jobs:
+                np.savetxt(f, _chunk(*job, params).T, fmt="%d", delimiter=",")
+            return path
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for job in jobs:
+                pending.append(pool.submit(_chunk, *job, params))
+                if len(pending) >= 2 * workers:
+                    np.savetxt(f, pending.pop(0).result().T, fmt="%d", delimiter=",")
+            for fut in pending:
+                np.savetxt(f, fut.result().T, fmt="%d", delimiter=",")
+    return path
+
+
 if __name__ == '__main__':
-    initializing()
+    import sys
+    if len(sys.argv) == 1:
+        initializing()
+    else:
+        import argparse
+        parser = argparse.ArgumentParser(description="Generate a seeded workload (.rrw or .csv)")
+        parser.add_argument("path")
+        parser.add_argument("n", type=int)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--arrival", choices=("poisson", "constant"), default="poisson")
+        parser.add_argument("--rate", type=float, default=0.2, help="arrivals per time unit")
+        parser.add_argument("--burst", choices=BURSTS, default="pareto")
+        parser.add_argument("--mean-burst", type=float, default=5.0)
+        parser.add_argument("--alpha", type=float, default=1.5, help="Pareto shape")
+        parser.add_argument("--chunksize", type=int, default=1 << 20)
+        parser.add_argument("--workers", "-j", type=int, default=None)
+        args = parser.parse_args()
+        generate_workload(args.path, args.n, seed=args.seed, arrival=args.arrival, rate=args.rate,
+                          burst=args.burst, mean_burst=args.mean_burst, alpha=args.alpha,
+                          chunksize=args.chunksize, workers=args.workers)
 
@@ -1,22 +1,212 @@
-import pandas as pd
-from Round_robin.RR import RR
-from Round_robin.CO_RR import RR_algorithm
-from initializing_process import par_initializing,initializing
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+from array import array
+from collections import OrderedDict
+from importlib import import_module
 from pathlib import Path
+from result_cache import DEFAULT_DIR, ResultCache, result_key
 # from dashboard import App
 
-pd.options.display.max_rows = 100
+# engines are imported on first use: pandas/numpy cost more than a small run itself.
+# name -> (module, function)
+ENGINES = {
+    "RR":            ("Round_robin.RR", "RR"),
+    "RR_vectorized": ("Round_robin.RR", "RR_vectorized"),
+    "RR_algorithm":  ("Round_robin.CO_RR", "RR_algorithm"),
+    "PRIO_RR":       ("Round_robin.PRIO_RR", "PRIO_RR"),
+    "MultiRR":       ("Round_robin.MULTI_RR", "MultiRR"),
+    "CalculateRR":   ("Round_robin.SEG_RR", "CalculateRR"),
+}
 
-def Arrival_time(data,quantum):
-    output = RR_algorithm(data,quantum)
+DATA_SET = Path(__file__).resolve().parent / 'db' / 'data_set.csv'
+
+# results survive restarts in db/cache; a changed data_set.csv gets new keys
+cache = ResultCache(path=DEFAULT_DIR)
+
+# column types for parsed CSVs: int32, except the arrival clock which keeps growing.
+# A column whose values do not fit falls back to int64; unknown columns are int64.
+DTYPES = {"process_id": 'i', "arrival_time": 'q', "burst_time": 'i', "priority": 'i'}
+NUMPY_BYTES = 1 << 20           # below this the parse is cheaper than importing numpy
+
+def _parse(text, typecodes):
+    # CSV body (bytes, integers only) -> one array per column. Commas become spaces, so
+    # the body is one flat run of fields and column k is every ncols-th one
+    ncols = len(typecodes)
+    flat = text.replace(b",", b" ")
+    if len(text) >= NUMPY_BYTES:
+        import numpy as np
+        fields = np.fromstring(flat, dtype=np.int64, sep=" ")
+    else:
+        fields = flat.split()
+    rows = len(fields) // ncols
+    if len(fields) % ncols or text.count(b",") != rows * (ncols - 1):
+        raise ValueError("rows with missing, extra or non-integer fields")
+    cols = []
+    for k, tc in enumerate(typecodes):
+        column = fields[k::ncols]
+        if isinstance(column, list):
+            try:
+                cols.append(array(tc, map(int, column)))
+            except OverflowError:
+                cols.append(array('q', map(int, column)))
+        elif tc == 'i' and rows and -2**31 <= column.min() and column.max() < 2**31:
+            cols.append(array('i', column.astype('<i4').tobytes()))
+        else:
+            cols.append(array('q', column.astype('<i8').tobytes()))
+    return cols
+
+def read_columns(path):
+    # workload columns without pandas: .rrw through workload.py, CSV parsed in one pass
+    # into compact arrays (every engine only needs len(), [] and tolist())
+    if Path(path).suffix == ".rrw":
+        from workload import load_workload
+        return load_workload(path)
+    with open(path, "rb") as f:
+        header = f.readline().decode().strip().split(",")
+        typecodes = [DTYPES.get(name, 'q') for name in header]
+        return dict(zip(header, _parse(f.read(), typecodes)))
+
+def _file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class WorkloadCache:
+    # parsed workloads kept in memory between queries, at most `maxsize` files (least
+    # recently used goes first). An entry is reused while the file's mtime and size are
+    # unchanged; a new mtime with the same size re-hashes the bytes before parsing again.
+    def __init__(self, maxsize=4):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()    # resolved path -> [mtime_ns, size, digest, columns]
+        self.parses = 0
+
+    def get(self, path):
+        path = str(Path(path).resolve())
+        st = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and entry[1] == st.st_size and (entry[0] == st.st_mtime_ns or entry[2] == _file_digest(path)):
+            entry[0] = st.st_mtime_ns
+            self.entries.move_to_end(path)
+            return entry[3]
+        digest = _file_digest(path)
+        columns = read_columns(path)
+        self.parses += 1
+        self.entries[path] = [st.st_mtime_ns, st.st_size, digest, columns]
+        self.entries.move_to_end(path)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return columns
+
+# one per process: interactive queries and batch quanta share the parsed file
+workloads = WorkloadCache()
+
+def run_engine(name, data, quantum, cs=0, cores=1):
+    engine = getattr(import_module(ENGINES[name][0]), ENGINES[name][1])
+    if name == "CalculateRR":
+        Proc = import_module("Round_robin.SEG_RR").Proc
+        procs = [Proc(p, a, b) for p, a, b in zip(data["process_id"].tolist(), data["arrival_time"].tolist(),
+                                                  data["burst_time"].tolist())]
+        _, _, totals = engine(procs, quantum, cs)
+        return dict(quantum=quantum, cs=cs, **totals)     # same entry as sweep() caches
+    if name == "MultiRR":
+        return engine(data, quantum, cores)
+    return engine(data, quantum)
+
+def _cache_name(name, cores):
+    if name == "CalculateRR":
+        return "CalculateRR:totals"
+    if name == "MultiRR":
+        return f"MultiRR:{cores}"
+    return name
+
+def cached(name, csv_path, quantum, cs=0, cores=1):
+    # the file is parsed only if something needs it, and then once per session
+    key = result_key(cache.file_hash(csv_path, workloads.get), _cache_name(name, cores), quantum,
+                     cs if name == "CalculateRR" else 0)
+    return cache.get_or_compute(key, lambda: run_engine(name, workloads.get(csv_path), quantum, cs, cores))
+
+def Arrival_time(csv_path,quantum):
+    output = cached("RR_algorithm", csv_path, quantum)
     print(output)
 
-def Non_Arrival_time(data,quantum):
-    output = RR(data,quantum)
+def Non_Arrival_time(csv_path,quantum):
+    output = cached("RR", csv_path, quantum)
     print(output)
 
-if __name__ == "__main__":
-    
+def Priority(csv_path,quantum):
+    output = cached("PRIO_RR", csv_path, quantum)
+    print(output)
+
+def _number(value):
+    # engines format their averages as text; pipelines want numbers
+    if isinstance(value, str):
+        for cast in (int, float):
+            try:
+                return cast(value)
+            except ValueError:
+                pass
+    return value
+
+def batch(argv=None):
+    parser = argparse.ArgumentParser(description="Run a Round Robin engine over workload files")
+    parser.add_argument("workloads", nargs="+", help="workload files (.csv or .rrw)")
+    parser.add_argument("--engine", "-e", default="RR_algorithm", choices=ENGINES)
+    parser.add_argument("--quantum", "-q", default="3", help="one quantum or a comma list")
+    parser.add_argument("--cs", type=int, default=0, help="context-switch cost (CalculateRR)")
+    parser.add_argument("--cores", type=int, default=1, help="CPU count (MultiRR)")
+    parser.add_argument("--format", "-f", default="json", choices=("json", "csv"))
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write db/cache")
+    args = parser.parse_args(argv)
+    try:
+        quanta = [int(q) for q in args.quantum.split(",")]
+    except ValueError:
+        parser.error(f"--quantum: expected integers, got {args.quantum!r}")
+    # the engines never finish with a zero quantum or no cores
+    if min(quanta) < 1:
+        parser.error("--quantum must be at least 1")
+    if args.cores < 1:
+        parser.error("--cores must be at least 1")
+    if args.cs < 0:
+        parser.error("--cs must not be negative")
+
+    rows = []
+    failed = 0
+    for path in args.workloads:
+        try:
+            data = None if not args.no_cache else workloads.get(path)
+            for q in quanta:
+                if args.no_cache:
+                    result = run_engine(args.engine, data, q, args.cs, args.cores)
+                else:
+                    result = cached(args.engine, path, q, args.cs, args.cores)
+                row = dict(file=path, engine=args.engine, quantum=q, cs=args.cs)
+                row.update((k, _number(v)) for k, v in result.items())
+                rows.append(row)
+        except Exception as e:
+            # a bad file or an engine that cannot run it (e.g. no rows) fails that file only
+            print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+            failed += 1
+
+    if args.format == "json":
+        json.dump(rows, sys.stdout, indent=1)
+        print()
+    else:
+        fields = list(dict.fromkeys(k for row in rows for k in row))
+        writer = csv.DictWriter(sys.stdout, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+    return 1 if failed else 0
+
+def interactive():
+    from initializing_process import par_initializing,initializing
+    from quantum_search import OBJECTIVES, find_best_quantum
+
     while(True):
         key = int(input("Key: "))
         if key == 3:
@@ -24,16 +214,29 @@ if __name__ == "__main__":
         elif key == 0:
             num = int(input("An amount of processes: "))
             par_initializing(num)
+        elif key == 5:
+            objective = input(f"OBJECTIVE ({'/'.join(OBJECTIVES)}): ").strip() or "avg_waiting"
+            cs = int(input("CS: ") or 0)
+            result = find_best_quantum(workloads.get(DATA_SET), objective, cs)
+            print({k: v for k, v in result.items() if k != "history"})
         else:
-            here = Path(__file__).resolve().parent
-            csv_path = here / 'db' / 'data_set.csv'
-            data = pd.read_csv(csv_path)
+            csv_path = DATA_SET
             quantum = int(input("QUANTUM: "))
+            if quantum < 1:
+                print("QUANTUM MUST BE AT LEAST 1")
+                continue
             if key == 1:
-                Non_Arrival_time(data=data,quantum=quantum)
+                Non_Arrival_time(csv_path=csv_path,quantum=quantum)
             elif key == 2:
-                Arrival_time(data=data,quantum=quantum)
+                Arrival_time(csv_path=csv_path,quantum=quantum)
+            elif key == 4:
+                Priority(csv_path=csv_path,quantum=quantum)
             else:
                 print("NOT THE VALID KEY")
 
-        
\ No newline at end of file
+if __name__ == "__main__":
+    # with arguments: headless batch run (python main.py db/data_set.csv -q 2,3 -f csv);
+    # without: the interactive menu
+    if len(sys.argv) > 1:
+        sys.exit(batch())
+    interactive()
@@ -0,0 +1,105 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+QUANTILES = (50, 95, 99)
+
+
+def per_process(pid, arrival, burst, finish, first_start):
+    # one row per process; every column is a contiguous NumPy array
+    arrival = np.asarray(arrival)
+    burst = np.asarray(burst)
+    finish = np.asarray(finish)
+    turnaround = finish - arrival
+    return pd.DataFrame({
+        "process_id": np.asarray(pid),
+        "arrival_time": arrival,
+        "burst_time": burst,
+        "finish_time": finish,
+        "waiting": turnaround - burst,
+        "turnaround": turnaround,
+        "response": np.asarray(first_start) - arrival,
+    })
+
+def jain(x):
+    # Jain's fairness index: 1 when every value is equal, 1/n when one takes everything
+    x = np.asarray(x, dtype=np.float64)
+    sq = np.dot(x, x)
+    return float(x.sum() ** 2 / (len(x) * sq)) if sq else 1.0
+
+def summary(frame):
+    # tail metrics of a per_process() frame. fairness is taken over the slowdown
+    # (turnaround / burst) so long and short jobs are compared on the same scale
+    if len(frame) == 0:
+        return dict({f"p{q}_waiting": 0.0 for q in QUANTILES}, max_response=0, fairness=1.0)
+    waiting = frame["waiting"].to_numpy()
+    burst = frame["burst_time"].to_numpy()
+    served = burst > 0
+    slowdown = frame["turnaround"].to_numpy()[served] / burst[served]
+    # order statistics ('lower'), the definition StreamSummary's sketch estimates
+    out = {f"p{q}_waiting": float(v) for q, v in zip(QUANTILES, np.percentile(waiting, QUANTILES, method="lower"))}
+    out["max_response"] = frame["response"].max().item()
+    out["fairness"] = jain(slowdown)
+    return out
+
+
+class QuantileSketch:
+    # streaming quantiles in bounded memory: a value x > 0 is counted in bucket
+    # ceil(log_gamma(x)), so any quantile comes back within rel_err of the exact one
+    # and the number of buckets only grows with log(max / min), not with the count
+    def __init__(self, rel_err=0.01):
+        self.rel_err = rel_err
+        self.gamma = (1 + rel_err) / (1 - rel_err)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0      # values <= 0
+        self.n = 0
+
+    def add(self, x):
+        self.n += 1
+        if x <= 0:
+            self.zeros += 1
+            return
+        k = math.ceil(math.log(x) / self.log_gamma)
+        self.buckets[k] = self.buckets.get(k, 0) + 1
+
+    def quantile(self, q):
+        # q in [0, 1]; estimates np.percentile(x, 100 * q, method='lower')
+        if self.n == 0:
+            return 0.0
+        rank = int(q * (self.n - 1))
+        if rank < self.zeros:
+            return 0.0
+        seen = self.zeros
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen > rank:
+                return 2 * self.gamma ** k / (self.gamma + 1)
+        return 0.0
+
+class StreamSummary:
+    # summary() for results that are never held together: exact max response and
+    # fairness from running sums, waiting-time percentiles from a QuantileSketch
+    def __init__(self, rel_err=0.01):
+        self.waiting = QuantileSketch(rel_err)
+        self.max_response = 0
+        self.slow_sum = 0.0
+        self.slow_sq = 0.0
+        self.served = 0
+
+    def add(self, burst, turnaround, waiting, response):
+        self.waiting.add(waiting)
+        if response > self.max_response:
+            self.max_response = response
+        if burst > 0:
+            s = turnaround / burst
+            self.slow_sum += s
+            self.slow_sq += s * s
+            self.served += 1
+
+    def result(self):
+        out = {f"p{q}_waiting": self.waiting.quantile(q / 100) for q in QUANTILES}
+        out["max_response"] = self.max_response
+        out["fairness"] = self.slow_sum ** 2 / (self.served * self.slow_sq) if self.slow_sq else 1.0
+        return out
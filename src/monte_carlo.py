@@ -0,0 +1,69 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from Round_robin.CO_RR import RR_algorithm
+from initializing_process import random_workload
+
+
+def _one(seed, n, quanta, skip_rounds):
+    # one generated workload, every quantum run on the same workload
+    data = random_workload(n, seed)
+    return [float(RR_algorithm(data, q, skip_rounds)["avg_waiting"]) for q in quanta]
+
+def monte_carlo(runs, n, quanta, seed=0, workers=None, skip_rounds=True):
+    # average waiting time of `runs` independent workloads of n processes, shape (runs, len(quanta)).
+    # Workloads live only inside the worker that simulates them; all quanta see the same
+    # workloads, so differences between columns are paired.
+    seeds = np.random.SeedSequence(seed).spawn(runs)
+    workers = workers or os.cpu_count() or 1
+    quanta = list(quanta)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = pool.map(_one, seeds, [n] * runs, [quanta] * runs, [skip_rounds] * runs,
+                        chunksize=max(1, runs // (4 * workers)))
+        return np.array(list(rows), dtype=np.float64).reshape(runs, len(quanta))
+
+def summarize(samples, quanta, level=0.95):
+    # per-quantum distribution of the average waiting time, with a normal-approximation
+    # confidence interval of its mean and of the paired difference to the best quantum
+    z = NormalDist().inv_cdf((1 + level) / 2)
+    runs = samples.shape[0]
+    mean = samples.mean(axis=0)
+    sem = samples.std(axis=0, ddof=1) / np.sqrt(runs) if runs > 1 else np.zeros_like(mean)
+    best = int(np.argmin(mean))
+    diff = samples - samples[:, [best]]
+    diff_sem = diff.std(axis=0, ddof=1) / np.sqrt(runs) if runs > 1 else np.zeros_like(mean)
+    p5, p50, p95 = np.percentile(samples, [5, 50, 95], axis=0)
+
+    return pd.DataFrame(dict(
+        quantum=quanta,
+        runs=runs,
+        mean=mean,
+        std=samples.std(axis=0, ddof=1) if runs > 1 else 0.0,
+        p5=p5, p50=p50, p95=p95,
+        ci_low=mean - z * sem,
+        ci_high=mean + z * sem,
+        diff_vs_best=diff.mean(axis=0),
+        diff_ci_low=diff.mean(axis=0) - z * diff_sem,
+        diff_ci_high=diff.mean(axis=0) + z * diff_sem,
+    ))
+
+
+if __name__ == "__main__":
+    from sweep import parse_range
+
+    parser = argparse.ArgumentParser(description="Monte Carlo RR over generated workloads")
+    parser.add_argument("--runs", "-r", type=int, default=1000)
+    parser.add_argument("--n", type=int, default=100, help="processes per workload")
+    parser.add_argument("--quantum", "-q", default="1:10", help="e.g. 1:10, 1:20:2 or 2,4,8")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", "-j", type=int, default=None)
+    args = parser.parse_args()
+
+    quanta = parse_range(args.quantum)
+    samples = monte_carlo(args.runs, args.n, quanta, args.seed, args.workers)
+    print(summarize(samples, quanta).to_string(index=False))
@@ -0,0 +1,195 @@
+import argparse
+import math
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+import numpy as np
+
+# objectives find_best_quantum() can minimise; throughput is maximised by minimising the makespan
+OBJECTIVES = ("avg_waiting", "avg_turnaround", "max_response", "p99_response", "throughput")
+
+INVPHI = (math.sqrt(5) - 1) / 2
+
+
+def _cost(arrival, burst, quantum, cs, objective, bound=math.inf):
+    # CalculateRR's timeline (idle gaps, a cs after every slice while work is left,
+    # arrivals during the cs queue behind the preempted process) reduced to what the
+    # objective needs. Returns the cost to minimise, or None as soon as the partial cost
+    # proves the final one is above `bound`.
+    n = len(arrival)
+    remain = list(burst)
+    left = sum(1 for b in burst if b > 0)
+    work_left = sum(burst)
+    total_burst = work_left
+    response = [-1]*n
+    ready = deque()
+    i = 0
+    t = 0
+    alive = 0           # arrived and not finished
+    waited = 0          # integral of (alive - running) dt = total waiting so far
+    over = 0            # responses already above bound
+    tail = n - math.floor(0.99 * (n - 1)) if n else 1   # this many responses > bound => p99 > bound
+
+    def admit(upto):
+        # a process that arrived inside the last slice has waited since its arrival
+        nonlocal i, alive, waited
+        while i < n and arrival[i] <= upto:
+            ready.append(i)
+            waited += upto - arrival[i]
+            i += 1
+            alive += 1
+
+    admit(t)
+    while left:
+        if not ready:
+            t = max(t, arrival[i])
+            admit(t)
+            continue
+
+        p = ready.popleft()
+        if response[p] < 0:
+            response[p] = t - arrival[p]
+            if response[p] > bound:
+                over += 1
+                if objective == "max_response" or (objective == "p99_response" and over >= tail):
+                    return None
+        run = min(quantum, remain[p])
+        waited += run * (alive - 1)
+        t += run
+        remain[p] -= run
+        work_left -= run
+        admit(t)
+
+        if remain[p] > 0:
+            ready.append(p)
+        else:
+            alive -= 1
+            if burst[p] > 0:
+                left -= 1
+
+        if cs > 0 and left > 0:
+            waited += cs * alive
+            t += cs
+            admit(t)
+
+        if objective == "avg_waiting":
+            if waited > bound * n:
+                return None
+        elif objective == "avg_turnaround":
+            if waited + total_burst > bound * n:
+                return None
+        elif objective == "throughput":
+            if t + work_left > bound:
+                return None
+
+    if objective == "avg_waiting":
+        return waited / n
+    if objective == "avg_turnaround":
+        return (waited + total_burst) / n
+    if objective == "throughput":
+        return t
+    response = [r if r >= 0 else 0 for r in response]
+    if objective == "max_response":
+        return max(response)
+    # order statistic, as metrics.summary() and the `tail` cut-off above define it
+    return float(np.percentile(response, 99, method="lower"))
+
+def candidates(burst, k=8):
+    # k quanta spread over the burst distribution (its quantiles), 1 .. max burst;
+    # anything above the longest burst schedules exactly like the longest burst
+    qs = np.ceil(np.quantile(np.asarray(burst, dtype=np.float64), np.linspace(0, 1, k)))
+    return [int(q) for q in np.unique(np.clip(qs, 1, None))]
+
+# objectives that are close to unimodal in the quantum; the tail ones jump around
+SMOOTH = ("avg_waiting", "avg_turnaround", "throughput")
+
+def find_best_quantum(data, objective="avg_waiting", cs=0, k=8):
+    # coarse pass over candidates(burst, k), then the range between the neighbours of
+    # the best candidate: an integer golden-section search for the averages and the
+    # makespan; for max/p99 response, coarse-to-fine rounds over that range (the burst
+    # quantiles inside it plus k evenly spaced quanta, keeping the best one's neighbours)
+    # until at most k quanta are left to scan. Every simulation is cut off as soon as it
+    # can no longer beat the best quantum found so far. A heuristic: the best quantum
+    # outside the range, or one the search steps over, is not seen.
+    if objective not in OBJECTIVES:
+        raise ValueError(f"unknown objective {objective!r}, expected one of {', '.join(OBJECTIVES)}")
+    arrival = np.asarray(data["arrival_time"])
+    order = np.argsort(arrival, kind="stable")
+    arrival = arrival[order].tolist()
+    burst = np.asarray(data["burst_time"])[order].tolist()
+    sorted_burst = sorted(burst)
+    n = len(burst)
+    if n == 0:
+        raise ValueError("empty workload")
+
+    memo = {}
+    history = []
+    best = [None, math.inf]
+
+    def f(q):
+        if q not in memo:
+            cost = _cost(arrival, burst, q, cs, objective, best[1])
+            memo[q] = math.inf if cost is None else cost
+            history.append((q, cost))
+            if cost is not None and cost < best[1]:
+                best[0], best[1] = q, cost
+        return memo[q]
+
+    coarse = candidates(burst, k)
+    for q in coarse:
+        f(q)
+
+    j = coarse.index(best[0])
+    a = coarse[j - 1] if j > 0 else 1
+    b = coarse[j + 1] if j + 1 < len(coarse) else coarse[j]
+    c = round(b - INVPHI * (b - a))
+    d = round(a + INVPHI * (b - a))
+    while objective in SMOOTH and b - a > 3 and a < c < d < b:
+        if f(c) <= f(d):
+            b, d = d, c
+            c = round(b - INVPHI * (b - a))
+        else:
+            a, c = c, d
+            d = round(a + INVPHI * (b - a))
+    while objective not in SMOOTH and b - a > k:
+        # each round keeps at most two of the even steps, so the range shrinks geometrically
+        inner = sorted_burst[bisect_right(sorted_burst, a):bisect_left(sorted_burst, b)]
+        grid = {a, b, best[0]} | {int(q) for q in np.linspace(a, b, max(k, 4)).round()}
+        if inner:
+            grid.update(candidates(inner, k))
+        grid = sorted(grid)
+        for q in grid:
+            f(q)
+        j = grid.index(best[0])
+        a = grid[j - 1] if j > 0 else a
+        b = grid[j + 1] if j + 1 < len(grid) else b
+    for q in range(a, b + 1):
+        f(q)
+
+    q, cost = best
+    value = n / cost if objective == "throughput" else cost
+    return {
+        "quantum": q,
+        "objective": objective,
+        "value": value,
+        "evaluations": len(history),
+        "pruned": sum(1 for _, c in history if c is None),
+        "history": history,
+    }
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+    from workload import load_workload
+
+    parser = argparse.ArgumentParser(description="Find the quantum that optimises a Round Robin objective")
+    parser.add_argument("--csv", default=str(Path(__file__).resolve().parent / "db" / "data_set.csv"),
+                        help="workload (.csv or .rrw)")
+    parser.add_argument("--objective", "-O", default="avg_waiting", choices=OBJECTIVES)
+    parser.add_argument("--cs", type=int, default=0, help="context-switch cost")
+    parser.add_argument("-k", type=int, default=8, help="coarse candidates")
+    args = parser.parse_args()
+
+    result = find_best_quantum(load_workload(args.csv), args.objective, args.cs, args.k)
+    print(f"quantum={result['quantum']}  {result['objective']}={result['value']:.4f}  "
+          f"({result['evaluations']} simulations, {result['pruned']} stopped early)")
@@ -0,0 +1,176 @@
+import hashlib
+import os
+import pickle
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+HASH_COLUMNS = ["process_id", "arrival_time", "burst_time", "priority"]
+DEFAULT_DIR = Path(__file__).resolve().parent / 'db' / 'cache'
+
+
+def data_hash(data):
+    # content hash of the workload columns (DataFrame, dict of arrays or mapped .rrw);
+    # numpy is only imported here so a cache hit never loads it
+    h = hashlib.blake2b(digest_size=16)
+    for col in HASH_COLUMNS:
+        if col not in data:
+            continue
+        if isinstance(data[col], array):
+            # main.read_columns() output: widened to the int64 bytes numpy would produce
+            values = data[col] if data[col].typecode == 'q' else array('q', data[col])
+            h.update(col.encode() + b"\0int64\0")
+            h.update(values.tobytes())
+            continue
+        import numpy as np
+        values = np.asarray(data[col])
+        if values.dtype.kind in "iub":
+            values = values.astype(np.int64)
+        elif values.dtype.kind == "f":
+            values = values.astype(np.float64)
+        else:
+            values = np.array([str(v) for v in values])
+        h.update(col.encode() + b"\0" + str(values.dtype).encode() + b"\0")
+        h.update(np.ascontiguousarray(values).tobytes())
+    return h.hexdigest()
+
+def procs_hash(processes):
+    # same idea for the dashboard's Proc lists (PIDs are strings there)
+    h = hashlib.blake2b(digest_size=16)
+    for p in processes:
+        h.update(f"{p.pid}\0{p.arrival}\0{p.burst}\n".encode())
+    return h.hexdigest()
+
+# part of every result_key(): bump it when an engine's results or the layout of a
+# cached value change, so entries pickled by older code are never hit again
+VERSION = 1
+
+def result_key(workload, engine, quantum, cs=0):
+    return hashlib.blake2b(f"v{VERSION}|{workload}|{engine}|{quantum}|{cs}".encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    # results (summary dicts, or (segments, stats, totals) for CalculateRR) keyed by
+    # result_key(). At most `maxsize` entries are kept in memory (least recently used
+    # go first); with `path` every entry is also pickled to <path>/<key>.pkl, and once
+    # those files pass `max_bytes` the least recently used ones are deleted.
+    def __init__(self, maxsize=64, path=None, max_bytes=256 << 20):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.disk_bytes = None              # size of the .pkl files, counted on the first put
+        self.path = Path(path) if path else None
+        self.entries = OrderedDict()
+        self.files = self._load_index()     # workload file -> (mtime_ns, size, data_hash)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def file_hash(self, path, load):
+        # data_hash of a workload file, re-read (through load(path)) only when its
+        # mtime or size changed, so an edited data_set.csv gets a new key
+        path = str(Path(path).resolve())
+        st = os.stat(path)
+        with self.lock:
+            known = self.files.get(path)
+        if known and known[:2] == (st.st_mtime_ns, st.st_size):
+            return known[2]
+        digest = data_hash(load(path))
+        with self.lock:
+            self.files[path] = (st.st_mtime_ns, st.st_size, digest)
+            index = dict(self.files)
+        if self.path:
+            self._write(self.path / "files.idx", index)
+        return digest
+
+    def _load_index(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path / "files.idx", "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return {}
+
+    def _write(self, target, value):
+        # write-then-rename, so readers never see half a file
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+        if self.path:
+            target = self.path / f"{key}.pkl"
+            try:
+                with open(target, "rb") as f:
+                    value = pickle.load(f)
+                os.utime(target)            # recently used: evicted last
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+            else:
+                self._remember(key, value)
+                with self.lock:
+                    self.hits += 1
+                return value
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.path:
+            target = self.path / f"{key}.pkl"
+            self._write(target, value)
+            with self.lock:
+                if self.disk_bytes is not None:
+                    self.disk_bytes += target.stat().st_size
+                if self.disk_bytes is None or self.disk_bytes > self.max_bytes:
+                    self._evict()
+
+    def _evict(self):
+        # oldest-used .pkl files go until the directory fits max_bytes again. The sizes
+        # are re-read here, so files written by other processes are counted too
+        files = []
+        for f in self.path.glob("*.pkl"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime_ns, st.st_size, f))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, f in files[:-1]:       # never the entry just written
+            if total <= self.max_bytes:
+                break
+            f.unlink(missing_ok=True)
+            total -= size
+        self.disk_bytes = total
+
+    def _remember(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self, disk=False):
+        with self.lock:
+            self.entries.clear()
+            self.files.clear()
+        if disk and self.path and self.path.exists():
+            for f in [*self.path.glob("*.pkl"), self.path / "files.idx"]:
+                f.unlink(missing_ok=True)
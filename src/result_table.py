@@ -0,0 +1,72 @@
+from array import array
+
+# sortable columns, in table order
+COLUMNS = ("pid", "ct", "wt", "tat", "rt")
+
+def _pid_key(pid):
+    # shorter first, so generated PIDs sort by number (P2 before P10) without parsing them
+    pid = str(pid)
+    return len(pid), pid
+
+
+class ResultTable:
+    # CalculateRR's per-PID stats as columns: one int64 array per metric and a list of
+    # PIDs. A sort order is an array of row indices, built once per column and read
+    # from the back for descending, so a view only ever touches the rows it shows.
+    def __init__(self, pids, ct, wt, tat, rt):
+        self.pids = pids
+        self.columns = {"ct": ct, "wt": wt, "tat": tat, "rt": rt}
+        self.row_of = {pid: i for i, pid in enumerate(pids)}
+        self.orders = {}
+        self.ranks = {}
+
+    @classmethod
+    def from_stats(cls, stats):
+        # {pid: {"CT", "WT", "TAT", "RT"}} as returned by CalculateRR
+        ct, wt, tat, rt = array('q'), array('q'), array('q'), array('q')
+        for s in stats.values():
+            ct.append(s["CT"])
+            wt.append(s["WT"])
+            tat.append(s["TAT"])
+            rt.append(s["RT"])
+        return cls(list(stats), ct, wt, tat, rt)
+
+    def __len__(self):
+        return len(self.pids)
+
+    def order(self, column):
+        idx = self.orders.get(column)
+        if idx is None:
+            values = [_pid_key(p) for p in self.pids] if column == "pid" else self.columns[column]
+            idx = array('i', sorted(range(len(values)), key=values.__getitem__))
+            self.orders[column] = idx
+        return idx
+
+    def row_at(self, position, column="pid", reverse=False):
+        # the row shown at `position` when sorted by column
+        idx = self.order(column)
+        return idx[len(idx) - 1 - position] if reverse else idx[position]
+
+    def rows(self, start, stop, column="pid", reverse=False):
+        # (pid, ct, wt, tat, rt) for positions start..stop-1 of the sorted view
+        c = self.columns
+        ct, wt, tat, rt = c["ct"], c["wt"], c["tat"], c["rt"]
+        out = []
+        for position in range(max(start, 0), min(stop, len(self.pids))):
+            i = self.row_at(position, column, reverse)
+            out.append((self.pids[i], ct[i], wt[i], tat[i], rt[i]))
+        return out
+
+    def position_of(self, pid, column="pid", reverse=False):
+        # where pid sits in the sorted view, None if it is not in the table
+        i = self.row_of.get(pid)
+        if i is None:
+            return None
+        rank = self.ranks.get(column)
+        if rank is None:
+            idx = self.order(column)
+            rank = array('i', bytes(4 * len(idx)))
+            for position, row in enumerate(idx):
+                rank[row] = position
+            self.ranks[column] = rank
+        return len(rank) - 1 - rank[i] if reverse else rank[i]
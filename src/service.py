@@ -0,0 +1,292 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter
+
+from main import DATA_SET, ENGINES, _number, cache, workloads
+from result_cache import data_hash
+
+# Long-lived simulation server: one JSON request per line over TCP (or a unix socket),
+# answered by JSON lines on the same connection:
+#   {"id": 7, "engine": "CalculateRR", "quantum": 3, "cs": 1,
+#    "path": "data_set.csv" | "workload": {"process_id": [...], "arrival_time": [...], ...},
+#    "per_process": true, "segments": true}
+#   -> {"type": "segments", "id": 7, "offset": 0, "start": [...], "end": [...], "kind": [...], "pid": [...]}  ...
+#   -> {"type": "processes", "id": 7, "offset": 0, "process_id": [...], "waiting": [...], ...}  ...
+#   -> {"type": "result", "id": 7, "result": {...}, "timing": {...}}     (or {"type": "error", ...})
+# {"op": "stats"} returns the server counters and latency quantiles.
+# A "path" is read relative to the workload root (db/ by default); nothing outside it is opened.
+PORT = 8765
+MAX_LINE = 256 << 20         # an inline workload arrives as one line
+
+
+def _warm():
+    # pool initializer: engines, pandas and numpy are imported once per worker, not per request
+    for module, _ in ENGINES.values():
+        import_module(module)
+    import_module("metrics")
+
+def simulate(name, data, quantum, cs=0, cores=1, per_process=False, segments=False):
+    # pool worker: one engine run -> (result, per-process columns or None, segment columns or None)
+    engine = getattr(import_module(ENGINES[name][0]), ENGINES[name][1])
+    processes = log = None
+    if name == "CalculateRR":
+        Proc = import_module("Round_robin.SEG_RR").Proc
+        procs = [Proc(p, a, b) for p, a, b in zip(data["process_id"].tolist(), data["arrival_time"].tolist(),
+                                                  data["burst_time"].tolist())]
+        log, stats, totals = engine(procs, quantum, cs, per_process=per_process, merge=True)
+        result = dict(quantum=quantum, cs=cs, **totals)
+        if per_process:
+            processes = stats
+    elif segments:
+        raise ValueError("segments are only recorded by CalculateRR")
+    elif name == "MultiRR":
+        result = engine(data, quantum, cores, per_process=per_process)
+    else:
+        result = engine(data, quantum, per_process=per_process)
+    if per_process and processes is None:
+        processes = result.pop("processes")
+    if processes is not None:
+        processes = {col: processes[col].tolist() for col in processes}
+    if segments:
+        kinds = import_module("Round_robin.SEG_RR").KINDS
+        log = dict(start=log.start.tolist(), end=log.end.tolist(), kind=[kinds[k] for k in log.kind],
+                   pid=[log.pids[c] if c >= 0 else None for c in log.code])
+    return {k: _number(v) for k, v in result.items()}, processes, log
+
+def _kill(pool):
+    # a run cannot be cancelled inside its worker: stop the processes themselves
+    # (ProcessPoolExecutor has no public call for that before 3.14)
+    procs = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for proc in procs:
+        proc.kill()
+
+
+class SimulationServer:
+    # workers:   pool processes; at most this many simulations run at once
+    # max_queue: simulations allowed to wait for a worker, further ones are refused ("busy")
+    # batch:     rows per streamed segments/processes line
+    # timeout:   seconds a simulation may run; past it the pool is killed and replaced,
+    #            and runs that shared it fail with BrokenProcessPool
+    # root:      directory "path" requests are confined to
+    # Identical requests that arrive while one is running share its result. Every line
+    # is written with drain(), so a slow reader holds back its own connection only.
+    def __init__(self, workers=None, max_queue=64, batch=4096, timeout=300, root=DATA_SET.parent):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.batch = batch
+        self.timeout = timeout
+        self.root = Path(root).resolve()
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_warm)
+        self.loader = ThreadPoolExecutor(1)     # WorkloadCache is used from one thread only
+        self.slots = asyncio.Semaphore(self.workers)
+        self.in_flight = {}
+        self.waiting = 0
+        self.counts = Counter()
+        from metrics import QuantileSketch
+        self.latency = QuantileSketch()
+
+    async def handle(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    msg = json.loads(line)
+                except ValueError as e:
+                    await self.send(writer, {"type": "error", "id": None, "error": f"bad request: {e}"})
+                    continue
+                if not isinstance(msg, dict):
+                    await self.send(writer, {"type": "error", "id": None, "error": "bad request: expected an object"})
+                    continue
+                await self.serve(msg, writer)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass        # server shutting down with this request still running
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def send(writer, msg):
+        writer.write(json.dumps(msg, default=lambda o: o.item()).encode() + b"\n")
+        await writer.drain()
+
+    async def load(self, msg):
+        # (columns, content hash); files go through main's WorkloadCache, so a warm
+        # server parses each workload once and re-reads it only after it changes
+        if "path" in msg:
+            path = self.resolve(msg["path"])
+            loop = asyncio.get_running_loop()
+            try:
+                digest = await loop.run_in_executor(self.loader, cache.file_hash, path, workloads.get)
+                return await loop.run_in_executor(self.loader, workloads.get, path), digest
+            except ValueError:
+                # parse errors quote the offending bytes: never send file content back
+                raise ValueError(f"{msg['path']}: not a workload file") from None
+            except OSError as e:
+                raise OSError(f"{msg['path']}: {e.strerror}") from None
+        if not isinstance(msg["workload"], dict):
+            raise ValueError("workload must be an object of columns")
+        try:
+            data = {col: array('q', values) for col, values in msg["workload"].items()}
+        except TypeError:
+            raise ValueError("workload columns must be lists of integers")
+        return data, data_hash(data)
+
+    def resolve(self, path):
+        if not isinstance(path, str):
+            raise ValueError("path must be a string")
+        full = (self.root / path).resolve()
+        if not full.is_relative_to(self.root):
+            raise ValueError(f"{path}: outside the workload root")
+        return full
+
+    async def run(self, args):
+        queued = perf_counter()
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            start = perf_counter()
+            pool = self.pool
+            try:
+                out = await asyncio.wait_for(asyncio.get_running_loop().run_in_executor(pool, partial(simulate, *args)),
+                                             self.timeout)
+            except asyncio.TimeoutError:
+                self.counts["timeouts"] += 1
+                if pool is self.pool:
+                    self.pool = ProcessPoolExecutor(self.workers, initializer=_warm)
+                    _kill(pool)
+                raise TimeoutError(f"simulation ran longer than {self.timeout}s") from None
+            return out, dict(queued_ms=(start - queued) * 1000, run_ms=(perf_counter() - start) * 1000)
+        finally:
+            self.slots.release()
+
+    async def serve(self, msg, writer):
+        t0 = perf_counter()
+        rid = msg.get("id")
+        if msg.get("op") == "stats":
+            await self.send(writer, dict(type="stats", id=rid, **self.stats()))
+            return
+        self.counts["requests"] += 1
+        try:
+            name = msg.get("engine", "RR_algorithm")
+            if name not in ENGINES:
+                raise ValueError(f"unknown engine {name!r}")
+            args = (name, int(msg["quantum"]), int(msg.get("cs", 0)), int(msg.get("cores", 1)),
+                    bool(msg.get("per_process")), bool(msg.get("segments")))
+            # engines loop forever on a zero quantum or no cores: refuse before a worker is taken
+            if args[1] < 1 or args[3] < 1:
+                raise ValueError("quantum and cores must be at least 1")
+            if args[2] < 0:
+                raise ValueError("cs must not be negative")
+            data, digest = await self.load(msg)
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            self.counts["errors"] += 1
+            await self.send(writer, {"type": "error", "id": rid, "error": f"{type(e).__name__}: {e}"})
+            return
+        loaded = perf_counter()
+
+        key = (digest,) + args
+        job = self.in_flight.get(key)
+        coalesced = job is not None
+        if coalesced:
+            self.counts["coalesced"] += 1
+        elif self.waiting >= self.max_queue:
+            self.counts["rejected"] += 1
+            await self.send(writer, {"type": "error", "id": rid, "error": "busy"})
+            return
+        else:
+            job = asyncio.ensure_future(self.run((args[0], data) + args[1:]))
+            self.in_flight[key] = job
+            job.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        try:
+            # shield: a client that goes away must not cancel a run others are waiting for
+            (result, processes, segments), timing = await asyncio.shield(job)
+        except Exception as e:
+            self.counts["errors"] += 1
+            await self.send(writer, {"type": "error", "id": rid, "error": f"{type(e).__name__}: {e}"})
+            return
+
+        sending = perf_counter()
+        for kind, columns in (("segments", segments), ("processes", processes)):
+            if columns is None:
+                continue
+            n = len(next(iter(columns.values()), ()))
+            for k in range(0, n, self.batch):
+                await self.send(writer, dict({col: v[k:k + self.batch] for col, v in columns.items()},
+                                             type=kind, id=rid, offset=k))
+        done = perf_counter()
+        # coalesced requests share the run's timing dict, each one answers with its own copy
+        timing = dict(timing, load_ms=(loaded - t0) * 1000, send_ms=(done - sending) * 1000,
+                      total_ms=(done - t0) * 1000, coalesced=coalesced)
+        self.latency.add(timing["total_ms"])
+        await self.send(writer, {"type": "result", "id": rid, "result": result, "timing": timing})
+
+    def stats(self):
+        return dict(self.counts, workers=self.workers, in_flight=len(self.in_flight), queued=self.waiting,
+                    p50_ms=self.latency.quantile(0.5), p99_ms=self.latency.quantile(0.99))
+
+
+async def serve(host="127.0.0.1", port=PORT, unix=None, workers=None, max_queue=64, timeout=300,
+                root=DATA_SET.parent):
+    server = SimulationServer(workers, max_queue, timeout=timeout, root=root)
+    if unix:
+        listener = await asyncio.start_unix_server(server.handle, unix, limit=MAX_LINE)
+    else:
+        listener = await asyncio.start_server(server.handle, host, port, limit=MAX_LINE)
+    # SIGINT/SIGTERM stop accepting and shut the pool down (no signal handlers on Windows:
+    # there Ctrl+C ends asyncio.run)
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            asyncio.get_running_loop().add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+    try:
+        async with listener:
+            await stop.wait()
+    finally:
+        _kill(server.pool)      # waiting for running simulations could take up to `timeout`
+
+def request(msg, host="127.0.0.1", port=PORT, unix=None):
+    # blocking client for scripts: yields every line the server answers to msg
+    if unix:
+        sock = socket.socket(socket.AF_UNIX)
+        sock.connect(unix)
+    else:
+        sock = socket.create_connection((host, port))
+    with sock, sock.makefile("rb") as replies:
+        sock.sendall(json.dumps(msg).encode() + b"\n")
+        for line in replies:
+            reply = json.loads(line)
+            yield reply
+            if reply["type"] in ("result", "error", "stats"):
+                return
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Round Robin simulations over a local socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", help="listen on this unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="simulation processes (default: CPU count)")
+    parser.add_argument("--max-queue", type=int, default=64, help="waiting simulations before refusing with 'busy'")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds one simulation may run")
+    parser.add_argument("--root", default=DATA_SET.parent, help="directory workload paths are read from (default: db/)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.max_queue, args.timeout, args.root))
+    except KeyboardInterrupt:
+        pass
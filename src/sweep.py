@@ -0,0 +1,96 @@
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from Round_robin.SEG_RR import Proc, CalculateRR
+from workload import load_workload
+from result_cache import DEFAULT_DIR, ResultCache, data_hash, result_key
+
+COLUMNS = ["process_id", "arrival_time", "burst_time"]
+
+# set in every worker by _attach(): views over the shared workload block
+_shm = None
+_workload = None
+
+
+def _attach(name, n):
+    global _shm, _workload
+    _shm = shared_memory.SharedMemory(name=name)
+    _workload = np.ndarray((len(COLUMNS), n), dtype=np.int64, buffer=_shm.buf)
+
+def _run(quantum, cs):
+    pid, arrival, burst = _workload
+    procs = [Proc(int(pid[k]), int(arrival[k]), int(burst[k])) for k in range(len(pid))]
+    _, _, totals = CalculateRR(procs, quantum, cs)
+    return dict(quantum=quantum, cs=cs, **totals)
+
+def sweep(data, quanta, css=(0,), workers=None, cache=None):
+    # run CalculateRR for every (quantum, cs) pair in a process pool.
+    # The workload is copied once into shared memory and every worker maps it,
+    # so a task only ships its two parameters. With a ResultCache, pairs already
+    # computed for this workload are not run again.
+    grid = list(itertools.product(quanta, css))
+    cached = {}
+    if cache is not None:
+        workload = data_hash(data)
+        keys = {(q, cs): result_key(workload, "CalculateRR:totals", q, cs) for q, cs in grid}
+        cached = {pair: hit for pair, key in keys.items() if (hit := cache.get(key)) is not None}
+    todo = [pair for pair in grid if pair not in cached]
+
+    rows = _run_pool(data, todo, workers) if todo else []
+    if cache is not None:
+        for row in rows:
+            cache.put(keys[(row["quantum"], row["cs"])], row)
+    done = {(row["quantum"], row["cs"]): row for row in rows}
+    done.update(cached)
+    return pd.DataFrame([done[pair] for pair in grid],
+                        columns=["quantum", "cs", "avg_wt", "avg_tat", "throughput", "cpu_util", "makespan"])
+
+def _run_pool(data, grid, workers):
+    arrays = np.ascontiguousarray(np.stack([np.asarray(data[c], dtype=np.int64) for c in COLUMNS]))
+    shm = shared_memory.SharedMemory(create=True, size=max(1, arrays.nbytes))
+    try:
+        np.ndarray(arrays.shape, dtype=np.int64, buffer=shm.buf)[:] = arrays
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                 initargs=(shm.name, arrays.shape[1])) as pool:
+            rows = list(pool.map(_run, *zip(*grid), chunksize=max(1, len(grid) // (4 * workers))))
+    finally:
+        shm.close()
+        shm.unlink()
+    return rows
+
+def parse_range(text):
+    # "1:10" -> 1..10 (inclusive), "1:10:2" -> 1,3,..,9, "1,2,5" -> 1,2,5
+    if ":" in text:
+        parts = [int(x) for x in text.split(":")]
+        start, stop = parts[0], parts[1]
+        step = parts[2] if len(parts) > 2 else 1
+        return list(range(start, stop + 1, step))
+    return [int(x) for x in text.split(",")]
+
+
+if __name__ == "__main__":
+    here = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Sweep quantum / context switch over one workload")
+    parser.add_argument("--csv", default=str(here / 'db' / 'data_set.csv'), help="workload (.csv or .rrw)")
+    parser.add_argument("--quantum", "-q", default="1:10", help="e.g. 1:10, 1:20:2 or 2,4,8")
+    parser.add_argument("--cs", default="0", help="same syntax as --quantum")
+    parser.add_argument("--workers", "-j", type=int, default=None)
+    parser.add_argument("--out", "-o", default=None, help="write the table to this CSV file")
+    parser.add_argument("--no-cache", action="store_true", help="do not read or write db/cache")
+    args = parser.parse_args()
+
+    data = load_workload(args.csv)
+    cache = None if args.no_cache else ResultCache(path=DEFAULT_DIR)
+    table = sweep(data, parse_range(args.quantum), parse_range(args.cs), args.workers, cache)
+    if args.out:
+        table.to_csv(args.out, index=False)
+    else:
+        print(table.to_string(index=False))
@@ -0,0 +1,77 @@
+import struct
+from pathlib import Path
+
+import numpy as np
+
+# Binary workload file (.rrw): a 32-byte header followed by one fixed-width
+# little-endian integer array per column, in COLUMNS order.
+#   magic b"RRWL" | version u4 | n u8 | column count u4 | item size u4 (4 or 8) | padding
+COLUMNS = ["process_id", "arrival_time", "burst_time", "priority"]
+MAGIC = b"RRWL"
+VERSION = 1
+HEADER = struct.Struct("<4sIQII8x")
+SUFFIX = ".rrw"
+
+
+def write_workload(path, data, dtype=np.int64):
+    # data: DataFrame or dict of columns; a missing priority column is written as 0
+    dtype = np.dtype(dtype).newbyteorder("<")
+    n = len(data["process_id"])
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, n, len(COLUMNS), dtype.itemsize))
+        for col in COLUMNS:
+            values = np.asarray(data[col]) if col in data else np.zeros(n)
+            f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+def read_header(path):
+    with open(path, "rb") as f:
+        magic, version, n, ncols, itemsize = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a workload file")
+    if version != VERSION or ncols != len(COLUMNS) or itemsize not in (4, 8):
+        raise ValueError(f"{path}: unsupported workload file (version {version}, {ncols} columns, {itemsize}-byte ints)")
+    return n, np.dtype(f"<i{itemsize}")
+
+def open_workload(path, mode="r"):
+    # columns as memory-mapped arrays: nothing is read until an engine touches it
+    n, dtype = read_header(path)
+    if n == 0:
+        return {col: np.zeros(0, dtype=dtype) for col in COLUMNS}
+    table = np.memmap(path, dtype=dtype, mode=mode, offset=HEADER.size, shape=(len(COLUMNS), n))
+    return {col: table[k] for k, col in enumerate(COLUMNS)}
+
+def iter_workload(path, chunksize=1 << 16):
+    # (pid, arrival, burst) rows for Round_robin.STREAM_RR, one mapped slice at a time
+    data = open_workload(path)
+    pid, arrival, burst = data["process_id"], data["arrival_time"], data["burst_time"]
+    for start in range(0, len(pid), chunksize):
+        end = start + chunksize
+        yield from zip(pid[start:end].tolist(), arrival[start:end].tolist(), burst[start:end].tolist())
+
+def load_workload(path):
+    # .rrw files are mapped, anything else is read as a data_set.csv-style CSV
+    if Path(path).suffix == SUFFIX:
+        return open_workload(path)
+    import pandas as pd
+    return pd.read_csv(path)
+
+def csv_to_workload(csv_path, bin_path=None, dtype=np.int64):
+    import pandas as pd
+    bin_path = bin_path or Path(csv_path).with_suffix(SUFFIX)
+    write_workload(bin_path, pd.read_csv(csv_path), dtype)
+    return bin_path
+
+def workload_to_csv(bin_path, csv_path=None):
+    import pandas as pd
+    csv_path = csv_path or Path(bin_path).with_suffix(".csv")
+    pd.DataFrame(open_workload(bin_path)).to_csv(csv_path, index=False)
+    return csv_path
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) not in (2, 3):
+        sys.exit("usage: python workload.py <file.csv | file.rrw> [output]")
+    src = sys.argv[1]
+    out = sys.argv[2] if len(sys.argv) == 3 else None
+    print(workload_to_csv(src, out) if Path(src).suffix == SUFFIX else csv_to_workload(src, out))